@@ -17,9 +17,29 @@ class Settings(BaseSettings):
     MONGODB_URL: str
     MONGODB_DB_NAME: str
 
+    # MongoDB connection pool and wire options
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int | None = None  # None keeps idle connections open
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGODB_COMPRESSORS: str = "zstd,snappy,zlib"  # In order of preference; ones not installed are skipped
+    MONGODB_LIST_READ_PREFERENCE: str = "secondaryPreferred"  # Read preference for read-only list endpoints
+
     # Flags
     IS_DEBUG: bool = False
 
+    # Novel search index
+    NOVEL_SEARCH_REFRESH_SECONDS: float = 300.0  # Full rebuild interval, to pick up writes from other processes
+
+    # Repository read-through caches for novels, sources and users
+    REPOSITORY_CACHE_ENABLED: bool = True
+    REPOSITORY_CACHE_TTL_SECONDS: float = 30.0  # Bounds how long writes from other processes go unseen
+    REPOSITORY_CACHE_MAX_ENTRIES: int = 1024  # Per cache
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # Users authenticated by access token; capped at token expiry
+
+    # Reading progress write-behind buffer
+    READING_PROGRESS_FLUSH_INTERVAL: float = 2.0  # Seconds between flushes
+
     # Translation settings
     DEEPL_API_KEY: str | None = None
     GOOGLE_TRANSLATE_API_KEY: str | None = None
@@ -31,9 +51,38 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 3600
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    PASSWORD_HASH_WORKERS: int = 4  # Threads running bcrypt; further logins queue for a free worker
+
+    # Playwright browser pool shared by the scrapers
+    BROWSER_POOL_MAX_PAGES: int = 4  # Pages leased at once; further scrapes wait
+    BROWSER_POOL_BROWSERS: int = 1
+    BROWSER_POOL_RECYCLE_AFTER_PAGES: int = 200  # Restart a browser after this many leases...
+    BROWSER_POOL_RECYCLE_AFTER_SECONDS: float = 1800.0  # ...or this long, to cap memory leaks
+
+    # HTTP clients shared by the scrapers and image downloads
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10  # Image downloads only; httpx has no per-host limit
+    HTTP_KEEPALIVE_SECONDS: float = 60.0  # Idle time before a kept-alive connection is closed
+    HTTP2_ENABLED: bool = True  # Used when the h2 package is installed
+    HTTP_DNS_CACHE_SECONDS: float = 300.0
+
+    # Chapter pipeline for bulk downloads and EPUB builds
+    CHAPTER_FETCH_WORKERS: int = 4  # Playwright sources are also bounded by BROWSER_POOL_MAX_PAGES
+    CHAPTER_CLEAN_WORKERS: int = 1
+    CHAPTER_TRANSLATE_WORKERS: int = 2
+    CHAPTER_PIPELINE_QUEUE_SIZE: int = 8  # Chapters a stage may get ahead of the next one
+
+    # Politeness towards scraped hosts, unless a source sets its own rate_limit
+    SCRAPER_REQUESTS_PER_SECOND: float = 1.0  # Per host
+    SCRAPER_BURST: int = 3
+    SCRAPER_MAX_IN_FLIGHT_PER_HOST: int = 2
+    SCRAPER_MAX_BACKOFF_SECONDS: float = 300.0  # Cap on the pause after a 429/503
 
     # ScraperAPI settings
     SCRAPERAPI_KEY: str | None = None
+    SCRAPERAPI_REQUESTS_PER_SECOND: float = 5.0  # Shared by the fallback of every source
+    SCRAPERAPI_MAX_IN_FLIGHT: int = 5  # Concurrent requests allowed by the ScraperAPI plan
 
     # Proxy settings
     PROXY_URL: str | None = None
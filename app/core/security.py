@@ -0,0 +1,68 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple, TypeVar
+from passlib.context import CryptContext
+from app.core.config import settings
+
+R = TypeVar("R")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with bcrypt on a bounded thread pool.
+
+    A bcrypt call takes a few hundred milliseconds of CPU; running it on the event loop would stall every
+    other request for that long. bcrypt releases the GIL, so the pool runs at most max_workers hashes
+    in parallel and further calls wait in the pool's queue. The time spent waiting is recorded.
+    """
+
+    def __init__(self, max_workers: int, context: CryptContext = pwd_context):
+        self.max_workers = max_workers
+        self.context = context
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self.in_flight = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., R], *args: Any) -> R:
+        submitted_at = time.perf_counter()
+
+        def timed() -> Tuple[float, R]:
+            return time.perf_counter() - submitted_at, func(*args)
+
+        self.in_flight += 1
+        try:
+            queue_time, result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, load and time spent queued for a worker."""
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "queue_time_avg_ms": self.queue_time_total / self.completed * 1000 if self.completed else 0.0,
+            "queue_time_max_ms": self.queue_time_max * 1000,
+        }
+
+    def shutdown(self) -> None:
+        """Wait for running hashes and stop the worker threads."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
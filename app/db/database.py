@@ -1,6 +1,43 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from importlib.util import find_spec
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from fastapi import Depends
+from pymongo import ReadPreference
 from ..core.config import settings
-from typing import Optional
+from .pool_monitor import pool_monitor
+from typing import Any, Dict, List, Optional
+
+# Python packages needed by each wire compressor; zlib ships with Python
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def available_compressors(compressors: str) -> List[str]:
+    """Return the configured wire compressors whose Python package is installed, in order of preference."""
+    names = [name.strip() for name in compressors.split(",") if name.strip()]
+    return [name for name in names if name in COMPRESSOR_MODULES and find_spec(COMPRESSOR_MODULES[name])]
+
+
+def client_options() -> Dict[str, Any]:
+    """Motor client options built from the settings."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "event_listeners": [pool_monitor],
+    }
+    if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+    compressors = available_compressors(settings.MONGODB_COMPRESSORS)
+    if compressors:
+        options["compressors"] = compressors
+    return options
 
 
 class Database:
@@ -13,8 +50,10 @@ class Database:
         try:
             url = mongodb_url or settings.MONGODB_URL
             db_name = mongodb_db or settings.MONGODB_DB_NAME
+            if settings.MONGODB_LIST_READ_PREFERENCE not in READ_PREFERENCES:
+                raise ValueError(f"Unknown MONGODB_LIST_READ_PREFERENCE: {settings.MONGODB_LIST_READ_PREFERENCE}")
             print(f"Connecting to MongoDB at {url}...")
-            cls.client = AsyncIOMotorClient(url)
+            cls.client = AsyncIOMotorClient(url, **client_options())
             cls.db = cls.client[db_name]
             # Test the connection
             await cls.db.command("ping")
@@ -40,6 +79,25 @@ class Database:
             raise RuntimeError("Database connection not available. Ensure connect() is called at startup.")
         return cls.db
 
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        """Effective pool configuration and current connection usage."""
+        if cls.client is None:
+            return {"connected": False}
+
+        options = cls.client.delegate.options
+        pool_options = options.pool_options
+        return {
+            "connected": True,
+            "max_pool_size": pool_options.max_pool_size,
+            "min_pool_size": pool_options.min_pool_size,
+            "max_idle_time_seconds": pool_options.max_idle_time_seconds,
+            "server_selection_timeout_seconds": options.server_selection_timeout,
+            "compressors": available_compressors(settings.MONGODB_COMPRESSORS),
+            "list_read_preference": settings.MONGODB_LIST_READ_PREFERENCE,
+            **pool_monitor.stats(),
+        }
+
 
 # Global database manager instance
 db_manager = Database()
@@ -58,3 +116,8 @@ async def close_mongo_connection():
 def get_database():
     """Get the database instance from the global database manager."""
     return db_manager.get_db()
+
+
+def get_list_database(db: AsyncIOMotorDatabase = Depends(get_database)) -> AsyncIOMotorDatabase:
+    """The database with the read preference for read-only list endpoints."""
+    return db.with_options(read_preference=READ_PREFERENCES[settings.MONGODB_LIST_READ_PREFERENCE])
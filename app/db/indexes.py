@@ -0,0 +1,95 @@
+import logging
+from typing import Dict, List
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# Declarative index registry, applied on every startup. To change an index, edit its definition
+# here and keep the same name: ensure_indexes replaces indexes whose options no longer match.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "chapters": [
+        IndexModel(
+            [("novel_id", ASCENDING), ("chapter_number", ASCENDING)], name="novel_chapter_number_unique", unique=True
+        ),
+    ],
+    "reading_progress": [
+        IndexModel([("user_id", ASCENDING), ("chapter_id", ASCENDING)], name="user_chapter_unique", unique=True),
+        IndexModel(
+            [("user_id", ASCENDING), ("novel_id", ASCENDING), ("chapter_number", ASCENDING)],
+            name="user_novel_chapter_number",
+        ),
+    ],
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        # Users stored before email_normalized existed are left out until the migration backfills them
+        IndexModel(
+            [("email_normalized", ASCENDING)],
+            name="email_normalized_unique",
+            unique=True,
+            partialFilterExpression={"email_normalized": {"$type": "string"}},
+        ),
+    ],
+    "novels": [
+        IndexModel([("source_url", ASCENDING)], name="source_url"),
+    ],
+    "sources": [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+    ],
+}
+
+logger = logging.getLogger(__name__)
+
+# Indexes the last ensure_indexes run could not create; reported by /health
+failed_indexes: List[str] = []
+
+# MongoDB error codes
+DUPLICATE_KEY = 11000
+INDEX_OPTIONS_CONFLICT = 85
+INDEX_KEY_SPECS_CONFLICT = 86
+
+
+async def drop_conflicting_index(collection, index: IndexModel) -> None:
+    """Drop the existing index that blocks creating index: the one with its name or with its key pattern."""
+    name = index.document["name"]
+    keys = list(index.document["key"].items())
+    existing = await collection.index_information()
+    for existing_name, info in existing.items():
+        if existing_name == name or list(info["key"]) == keys:
+            try:
+                await collection.drop_index(existing_name)
+            except OperationFailure as e:
+                # Another worker replacing the same index may have dropped it first
+                print(f"Could not drop index {collection.name}.{existing_name}: {e}")
+
+
+async def ensure_indexes(db) -> List[str]:
+    """Create every registered index that is missing or outdated. Safe to run repeatedly."""
+    failed = []
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                if e.code in (INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                    print(f"Index {collection_name}.{name} changed, recreating it")
+                    try:
+                        await drop_conflicting_index(collection, index)
+                        await collection.create_indexes([index])
+                        continue
+                    except OperationFailure as retry_error:
+                        e = retry_error
+
+                if e.code == DUPLICATE_KEY:
+                    logger.error(
+                        "Could not create unique index %s.%s: the collection has duplicate entries, so the app runs "
+                        "without that constraint. Clean them up and restart to create it.",
+                        collection_name,
+                        name,
+                    )
+                else:
+                    logger.error("Error creating index %s.%s: %s", collection_name, name, e)
+                failed.append(f"{collection_name}.{name}")
+
+    failed_indexes[:] = failed
+    return failed
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, NamedTuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from .indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "migrations"
+
+# A worker holding a migration renews its lease while it runs; one that stops renewing is presumed dead
+MIGRATION_LEASE_SECONDS = 300
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[..., Awaitable[None]]
+
+
+async def backfill_novel_counters(db) -> None:
+    """Store the chapter counters on every novel document."""
+    from app.repositories.novel_repository import NovelRepository
+
+    await NovelRepository(db).reconcile_counters()
+
+
+async def backfill_reading_progress_chapters(db, batch_size: int = 1000) -> None:
+    """Copy novel_id and chapter_number from each chapter onto its reading progress documents."""
+    last_id = None
+    while True:
+        query = {"novel_id": {"$exists": False}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.reading_progress.find(query, {"chapter_id": 1}).sort("_id", 1).to_list(length=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        chapter_ids = [
+            ObjectId(progress["chapter_id"]) for progress in batch if ObjectId.is_valid(progress["chapter_id"])
+        ]
+        chapters = await db.chapters.find({"_id": {"$in": chapter_ids}}, {"novel_id": 1, "chapter_number": 1}).to_list(
+            length=None
+        )
+        chapters_by_id = {str(chapter["_id"]): chapter for chapter in chapters}
+
+        operations = []
+        for progress in batch:
+            chapter = chapters_by_id.get(str(progress["chapter_id"]))
+            # Progress for chapters that no longer exist is left as is
+            if chapter:
+                operations.append(
+                    UpdateOne(
+                        {"_id": progress["_id"]},
+                        {"$set": {"novel_id": chapter["novel_id"], "chapter_number": chapter["chapter_number"]}},
+                    )
+                )
+        if operations:
+            await db.reading_progress.bulk_write(operations, ordered=False)
+
+
+async def backfill_normalized_emails(db, batch_size: int = 1000) -> None:
+    """Store the lowercased email of every user as email_normalized."""
+    from app.repositories.user_repository import normalize_email
+
+    last_id = None
+    while True:
+        query = {"email_normalized": {"$exists": False}, "email": {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.users.find(query, {"email": 1}).sort("_id", 1).to_list(length=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        operations = [
+            UpdateOne({"_id": user["_id"]}, {"$set": {"email_normalized": normalize_email(user["email"])}})
+            for user in batch
+        ]
+        await db.users.bulk_write(operations, ordered=False)
+
+
+# Versioned data migrations, applied once each in version order. Append new entries; never renumber.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Backfill chapter counters on novels", backfill_novel_counters),
+    Migration(2, "Store novel_id and chapter_number on reading progress", backfill_reading_progress_chapters),
+    Migration(3, "Store the normalized email of users", backfill_normalized_emails),
+]
+
+
+async def claim_migration(collection, migration: Migration, owner: ObjectId) -> bool:
+    """Take the lease on a migration. False if it is applied or another live worker holds it."""
+    now = datetime.utcnow()
+    claim = {
+        "description": migration.description,
+        "status": "running",
+        "owner": owner,
+        "started_at": now,
+        "lease_expires_at": now + timedelta(seconds=MIGRATION_LEASE_SECONDS),
+    }
+    try:
+        await collection.insert_one({"_id": migration.version, **claim})
+        return True
+    except DuplicateKeyError:
+        pass
+
+    # A running claim whose lease ran out belongs to a worker that died mid-migration: take it over.
+    # Claims written before leases existed have no expiry and are stale as well.
+    stale = await collection.find_one_and_update(
+        {
+            "_id": migration.version,
+            "status": "running",
+            "$or": [{"lease_expires_at": {"$lt": now}}, {"lease_expires_at": {"$exists": False}}],
+        },
+        {"$set": claim},
+    )
+    if stale is not None:
+        print(f"Taking over stale claim on migration {migration.version}")
+        return True
+    return False
+
+
+async def keep_lease(collection, version: int, owner: ObjectId) -> None:
+    """Extend the lease on a claimed migration until cancelled."""
+    while True:
+        await asyncio.sleep(MIGRATION_LEASE_SECONDS / 3)
+        await collection.update_one(
+            {"_id": version, "owner": owner},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=MIGRATION_LEASE_SECONDS)}},
+        )
+
+
+async def run_migrations(db) -> List[int]:
+    """Apply pending migrations and record them in the migrations collection."""
+    collection = db[MIGRATIONS_COLLECTION]
+    owner = ObjectId()
+    applied = []
+
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        # Claim the version first so that concurrent workers don't apply the same migration twice
+        if not await claim_migration(collection, migration, owner):
+            continue
+
+        print(f"Applying migration {migration.version}: {migration.description}")
+        heartbeat = asyncio.create_task(keep_lease(collection, migration.version, owner))
+        try:
+            await migration.apply(db)
+        except Exception as e:
+            print(f"Migration {migration.version} failed: {e}")
+            await collection.delete_one({"_id": migration.version, "owner": owner})
+            raise
+        finally:
+            heartbeat.cancel()
+
+        await collection.update_one(
+            {"_id": migration.version, "owner": owner},
+            {"$set": {"status": "applied", "applied_at": datetime.utcnow()}, "$unset": {"lease_expires_at": ""}},
+        )
+        applied.append(migration.version)
+
+    return applied
+
+
+async def migrate_database(db) -> None:
+    """Bring the database up to date: pending migrations first, then the index registry."""
+    applied = await run_migrations(db)
+    if applied:
+        print(f"Applied migrations: {applied}")
+
+    failed = await ensure_indexes(db)
+    if failed:
+        logger.error("Indexes not created, see /health: %s", failed)
+    else:
+        print("Database indexes are up to date")
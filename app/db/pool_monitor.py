@@ -0,0 +1,60 @@
+from typing import Any, Dict
+from pymongo import monitoring
+
+
+class ConnectionPoolMonitor(monitoring.ConnectionPoolListener):
+    """Counts connection pool events so that health checks can report pool usage."""
+
+    def __init__(self):
+        self.checked_out = 0  # Connections currently in use
+        self.max_checked_out = 0
+        self.total_checkouts = 0
+        self.checkout_failures = 0
+        self.open_connections = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "total_checkouts": self.total_checkouts,
+            "checkout_failures": self.checkout_failures,
+            "open_connections": self.open_connections,
+        }
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+        self.total_checkouts += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def connection_checked_in(self, event):
+        self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_closed(self, event):
+        self.open_connections = max(0, self.open_connections - 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+pool_monitor = ConnectionPoolMonitor()
@@ -1,8 +1,14 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from .routers import api_router
-from .db.database import connect_to_mongo, close_mongo_connection
+from .db.database import connect_to_mongo, close_mongo_connection, get_database
+from .db.migrations import migrate_database
+from .repositories.progress_buffer import reading_progress_buffer
+from .services.core.browser_pool import browser_pool
+from .services.core.http_clients import http_clients
+from .services.core.job_service import job_service
 from .core.config import settings
+from .core.security import password_hasher
 from fastapi.middleware.cors import CORSMiddleware
 from scalar_fastapi import get_scalar_api_reference
 
@@ -12,9 +18,16 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
     await connect_to_mongo()
+    await migrate_database(get_database())
+    reading_progress_buffer.start(get_database())
     yield
     # Shutdown
     print("Shutting down...")
+    await job_service.shutdown()
+    await browser_pool.close()
+    await http_clients.close()
+    await reading_progress_buffer.stop()
+    password_hasher.shutdown()
     await close_mongo_connection()
 
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl, field_validator
-from typing import Optional, List
+from typing import Optional, List, Union
 from bson import ObjectId
 from datetime import datetime
 from .novel import PyObjectId
@@ -28,6 +28,22 @@ class Chapter(BaseModel):
         json_encoders = {ObjectId: str}
 
 
+class ChapterSummary(BaseModel):
+    """Lightweight chapter model for lists that don't need the whole document."""
+
+    id: PyObjectId = Field(alias="_id")
+    chapter_number: int
+    title: str
+    chapter_title: Optional[str] = None
+    read: bool = False
+    downloaded: bool = False
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+
 class ChapterCreate(BaseModel):
     """Model for creating a new chapter."""
 
@@ -62,11 +78,19 @@ class ChapterUpdate(BaseModel):
 class ChapterListResponse(BaseModel):
     """Response model for paginated chapter lists."""
 
-    chapters: Optional[List[Chapter]] = None
+    chapters: Optional[List[Union[Chapter, ChapterSummary]]] = None
     total: int
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the following page
+
+
+class ChapterFetchResponse(ChapterListResponse):
+    """Response model for fetching chapters from the source."""
+
+    inserted: int = 0  # New chapters stored
+    matched: int = 0  # Chapters that already existed
 
 
 class ChapterDownloadResponse(BaseModel):
@@ -74,6 +98,7 @@ class ChapterDownloadResponse(BaseModel):
 
     type: str  # "novel" or "manhwa"
     chapters: List[dict]  # List of chapter content
+    failed: List[dict] = []  # Chapters that could not be downloaded, with the error
 
 
 class ReadingProgress(BaseModel):
@@ -82,6 +107,8 @@ class ReadingProgress(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     user_id: PyObjectId
     chapter_id: PyObjectId
+    novel_id: Optional[PyObjectId] = None  # Copied from the chapter so progress can be queried per novel
+    chapter_number: Optional[int] = None
     progress: float = 0.0  # Progress percentage (0.0 to 1.0)
     last_updated: datetime = Field(default_factory=datetime.utcnow)
 
@@ -96,6 +123,8 @@ class ReadingProgressCreate(BaseModel):
 
     user_id: PyObjectId
     chapter_id: PyObjectId
+    novel_id: Optional[PyObjectId] = None
+    chapter_number: Optional[int] = None
     progress: float
 
 
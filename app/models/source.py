@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlsplit
 from bson import ObjectId
 from datetime import datetime
 from pydantic_core import core_schema
@@ -53,6 +54,56 @@ class ContentType(str, Enum):
     MANHWA = "manhwa"
 
 
+class RateLimit(BaseModel):
+    """How politely a source's hosts are scraped; see HostScheduler."""
+
+    requests_per_second: float = Field(1.0, gt=0)
+    burst: int = Field(3, ge=1)  # Requests allowed back to back after an idle period
+    max_in_flight: int = Field(2, ge=1)
+
+
+# Ad networks and trackers that text pages pull in; an entry without a dot matches any host label
+AD_AND_TRACKER_DOMAINS = [
+    "pubadx",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagservices.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "popads.net",
+    "propellerads.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "facebook.net",
+]
+
+
+class ResourcePolicy(BaseModel):
+    """Requests a Playwright scraper aborts; text pages only need the DOM."""
+
+    blocked_resource_types: List[str] = Field(default_factory=lambda: ["image", "media", "font"])
+    blocked_domains: List[str] = Field(default_factory=lambda: list(AD_AND_TRACKER_DOMAINS))
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        labels = host.split(".")
+        for domain in self.blocked_domains:
+            if "." in domain:
+                if host == domain or host.endswith("." + domain):
+                    return True
+            elif domain in labels:
+                return True
+        return False
+
+
 class SourceBase(BaseModel):
     name: str
     base_url: str
@@ -1,17 +1,36 @@
 from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel, HttpUrl
+from pymongo import ReadPreference, ReturnDocument
+from pydantic import BaseModel, HttpUrl, TypeAdapter
 
 T = TypeVar("T", bound=BaseModel)
 CreateT = TypeVar("CreateT", bound=BaseModel)
 UpdateT = TypeVar("UpdateT", bound=BaseModel)
 
 
+@lru_cache(maxsize=None)
+def list_adapter(model_class: Type[T]) -> TypeAdapter:
+    """Cached TypeAdapter that validates a whole list of documents in a single call."""
+    return TypeAdapter(List[model_class])
+
+
+@lru_cache(maxsize=None)
+def projection_for(model_class: Type[BaseModel]) -> Dict[str, int]:
+    """Mongo projection that fetches only the fields of a model."""
+    projection = {field.alias or name: 1 for name, field in model_class.model_fields.items()}
+    if "_id" not in projection:
+        projection["_id"] = 0
+    return projection
+
+
 class BaseRepository(Generic[T, CreateT, UpdateT]):
     def __init__(self, db: AsyncIOMotorDatabase, collection_name: str, model_class: Type[T]):
         self.db = db
         self.collection = getattr(db, collection_name)
+        # Loads that fill the process-wide caches read from here: a lagging secondary must not fill them
+        self.primary_collection = self.collection.with_options(read_preference=ReadPreference.PRIMARY)
         self.model_class = model_class
 
     def _convert_urls_to_strings(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,16 +54,25 @@ class BaseRepository(Generic[T, CreateT, UpdateT]):
                 result[key] = value
         return result
 
-    async def create(self, item: CreateT) -> T:
-        """Create a new item."""
+    def _to_models(self, items: List[Dict[str, Any]]) -> List[T]:
+        """Convert documents read from the collection into models."""
+        return list_adapter(self.model_class).validate_python(items)
+
+    def _build_document(self, item: CreateT) -> Dict[str, Any]:
+        """Build the document stored for a new item."""
         item_dict = item.model_dump()
         item_dict = self._convert_urls_to_strings(item_dict)
         item_dict["added_at"] = datetime.utcnow()
         item_dict["last_updated"] = item_dict["added_at"]
+        return item_dict
+
+    async def create(self, item: CreateT) -> T:
+        """Create a new item."""
+        item_dict = self._build_document(item)
 
         result = await self.collection.insert_one(item_dict)
-        created_item = await self.collection.find_one({"_id": result.inserted_id})
-        return self.model_class(**created_item)
+        item_dict["_id"] = result.inserted_id
+        return self.model_class(**item_dict)
 
     async def get_by_id(self, item_id: Any) -> Optional[T]:
         """Get an item by ID."""
@@ -60,12 +88,9 @@ class BaseRepository(Generic[T, CreateT, UpdateT]):
         update_data = self._convert_urls_to_strings(update_data)
         update_data["last_updated"] = datetime.utcnow()
 
-        result = await self.collection.update_one({"_id": item_id}, {"$set": update_data})
-
-        if result.matched_count == 0:
-            return None
-
-        updated_item = await self.collection.find_one({"_id": item_id})
+        updated_item = await self.collection.find_one_and_update(
+            {"_id": item_id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
         return self.model_class(**updated_item) if updated_item else None
 
     async def delete(self, item_id: Any) -> bool:
@@ -73,8 +98,16 @@ class BaseRepository(Generic[T, CreateT, UpdateT]):
         result = await self.collection.delete_one({"_id": item_id})
         return result.deleted_count > 0
 
-    async def filter(self, query: Dict[str, Any], skip: int = 0, limit: int = 100) -> List[T]:
-        """Filter items by query parameters."""
-        cursor = self.collection.find(query).skip(skip).limit(limit)
+    async def filter(
+        self, query: Dict[str, Any], skip: int = 0, limit: int = 100, model_class: Optional[Type[BaseModel]] = None
+    ) -> List[T]:
+        """Filter items by query parameters.
+
+        With model_class, only the fields of that model are fetched and the items are returned as that model.
+        """
+        projection = projection_for(model_class) if model_class else None
+        cursor = self.collection.find(query, projection).skip(skip).limit(limit)
         items = await cursor.to_list(length=limit)
-        return [self.model_class(**item) for item in items]
+        if model_class:
+            return list_adapter(model_class).validate_python(items)
+        return self._to_models(items)
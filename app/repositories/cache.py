@@ -0,0 +1,185 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+from app.core.config import settings
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Process-local read-through cache: a bounded LRU whose entries also expire after ttl_seconds.
+
+    Repositories invalidate an entry whenever they write the document behind it. Writes made by other
+    processes are picked up once the entry expires. A load that overlaps an invalidation of its key is
+    returned to the caller but not cached, so a stale value is never kept.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        """Return the cached value of key, calling loader on a miss. None results are not cached."""
+        if not self.enabled:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        generation = (self._epoch, self._generations.get(key, 0))
+        value = await loader()
+        if value is not None and generation == (self._epoch, self._generations.get(key, 0)):
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop the entry of key, or every entry if key is None."""
+        if key is None:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+            return
+
+        self._entries.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class PrincipalCache:
+    """Process-local cache of the user authenticated by each access token, keyed by the token's SHA-256.
+
+    Entries expire after ttl_seconds or when the token itself expires, whichever comes first. Every
+    write to a user invalidates all of that user's tokens: each written user gets a new generation, and an
+    entry loaded under an older generation is treated as a miss. Users never written share a base
+    generation; once more than max_entries users have their own, they are all forgotten and the base is
+    moved past them, which invalidates every cached principal.
+    """
+
+    name = "principals"
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._user_generations: Dict[str, int] = {}
+        self._last_generation = 0
+        self._base_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def generation(self, user_id: Any) -> int:
+        """Current generation of a user; pass it to put() to detect writes made while loading."""
+        return self._user_generations.get(str(user_id), self._base_generation)
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached principal of a token, or None."""
+        if not self.enabled:
+            return None
+
+        key = self.token_key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, generation, principal = entry
+            if expires_at > time.monotonic() and generation == self.generation(principal.id):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return principal
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, token: str, principal: Any, generation: int, token_expires_in: Optional[float] = None) -> None:
+        """Cache the principal of a token, unless the user was written since generation was read."""
+        if not self.enabled or generation != self.generation(principal.id):
+            return
+
+        ttl = self.ttl_seconds if token_expires_in is None else min(self.ttl_seconds, token_expires_in)
+        if ttl <= 0:
+            return
+        key = self.token_key(token)
+        self._entries[key] = (time.monotonic() + ttl, generation, principal)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Drop the cached principals of every token of a user."""
+        self._last_generation += 1
+        self._user_generations[str(user_id)] = self._last_generation
+        if len(self._user_generations) > self.max_entries:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop every cached principal, and the generations of every user with them."""
+        self._entries.clear()
+        self._user_generations.clear()
+        # Loads that started before this must not be cached, whichever generation they read
+        self._last_generation += 1
+        self._base_generation = self._last_generation
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _repository_cache(name: str) -> TTLCache[Dict[str, Any]]:
+    return TTLCache(
+        name,
+        max_entries=settings.REPOSITORY_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.REPOSITORY_CACHE_TTL_SECONDS,
+        enabled=settings.REPOSITORY_CACHE_ENABLED,
+    )
+
+
+# Documents by id string, shared by every repository instance of the process
+novel_cache = _repository_cache("novels")
+source_cache = _repository_cache("sources")
+user_cache = _repository_cache("users")
+# Users by access token, so authenticated requests skip decoding the token and loading the user
+principal_cache = PrincipalCache(
+    max_entries=settings.REPOSITORY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    enabled=settings.REPOSITORY_CACHE_ENABLED,
+)
+
+repository_caches = {cache.name: cache for cache in (novel_cache, source_cache, user_cache, principal_cache)}
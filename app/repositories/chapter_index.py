@@ -0,0 +1,99 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+ChapterT = TypeVar("ChapterT")
+
+# Novels whose index is kept in memory; the least recently used one is dropped first
+MAX_CACHED_NOVELS = 256
+
+
+class ChapterNumberIndex:
+    """Sorted chapter numbers of one novel, with the id of the chapter stored at the same position."""
+
+    __slots__ = ("numbers", "ids")
+
+    def __init__(self, entries: Iterable[Tuple[float, str]]):
+        entries = sorted(entries)
+        self.numbers = array("d", (number for number, _ in entries))
+        self.ids: List[str] = [chapter_id for _, chapter_id in entries]
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def find(self, chapter_number: float) -> Optional[str]:
+        """Return the id of a chapter number, or None if the novel doesn't have it."""
+        position = bisect_left(self.numbers, chapter_number)
+        if position < len(self.numbers) and self.numbers[position] == chapter_number:
+            return self.ids[position]
+        return None
+
+    def next(self, chapter_number: float) -> Optional[str]:
+        """Return the id of the first chapter after chapter_number."""
+        position = bisect_right(self.numbers, chapter_number)
+        return self.ids[position] if position < len(self.ids) else None
+
+    def previous(self, chapter_number: float) -> Optional[str]:
+        """Return the id of the last chapter before chapter_number."""
+        position = bisect_left(self.numbers, chapter_number)
+        return self.ids[position - 1] if position > 0 else None
+
+
+class ChapterIndexCache:
+    """Process-local cache of the chapter number index of each novel, loaded lazily from the chapters collection.
+
+    Repositories invalidate a novel whenever its chapters are created or deleted. A load that overlaps an
+    invalidation is used for that request but not cached, so a stale index is never kept.
+    """
+
+    def __init__(self, max_novels: int = MAX_CACHED_NOVELS):
+        self.max_novels = max_novels
+        self._indexes: "OrderedDict[str, ChapterNumberIndex]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    async def get(self, collection: AsyncIOMotorCollection, novel_id) -> ChapterNumberIndex:
+        """Get the index of a novel, loading it from the collection if it isn't cached."""
+        key = str(novel_id)
+        index = self._indexes.get(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+            return index
+
+        generation = (self._epoch, self._generations.get(key, 0))
+        chapters = await collection.find({"novel_id": key}, {"chapter_number": 1}).to_list(length=None)
+        index = ChapterNumberIndex((chapter["chapter_number"], str(chapter["_id"])) for chapter in chapters)
+
+        if generation == (self._epoch, self._generations.get(key, 0)):
+            self._indexes[key] = index
+            if len(self._indexes) > self.max_novels:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, novel_id=None) -> None:
+        """Drop the cached index of a novel, or of every novel if novel_id is None."""
+        if novel_id is None:
+            self._indexes.clear()
+            self._generations.clear()
+            self._epoch += 1
+            return
+
+        key = str(novel_id)
+        self._indexes.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+
+def select_chapter_range(
+    chapters: Sequence[ChapterT], start: Optional[float] = None, end: Optional[float] = None
+) -> List[ChapterT]:
+    """Return the chapters numbered within [start, end]. chapters must already be in chapter order."""
+    low = bisect_left(chapters, start, key=lambda chapter: chapter.chapter_number) if start is not None else 0
+    high = (
+        bisect_right(chapters, end, key=lambda chapter: chapter.chapter_number) if end is not None else len(chapters)
+    )
+    return chapters[low:high]
+
+
+chapter_index_cache = ChapterIndexCache()
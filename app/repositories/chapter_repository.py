@@ -1,13 +1,105 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Type, Callable
 from datetime import datetime
+import base64
+import binascii
+import json
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteMany, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+from pydantic import BaseModel
 from app.models.chapter import Chapter, ChapterCreate, ChapterUpdate, PyObjectId
+from app.repositories.base_repository import list_adapter, projection_for
+from app.repositories.cache import TTLCache, novel_cache
+from app.repositories.chapter_index import ChapterIndexCache, chapter_index_cache
+
+# Per-novel chapter counters stored on the novel document
+NOVEL_COUNTER_FIELDS = ("total_chapters", "read_chapters", "downloaded_chapters", "last_chapter_number")
+
+BULK_WRITE_BATCH_SIZE = 1000
+DUPLICATE_GROUPS_BATCH_SIZE = 500
+DUPLICATE_KEY_ERROR = 11000
+
+
+def encode_chapter_cursor(chapter_number: int, sort_order: str) -> str:
+    """Encode the position after a chapter as an opaque pagination cursor."""
+    payload = json.dumps({"n": chapter_number, "o": sort_order}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_chapter_cursor(cursor: str) -> tuple[int, str]:
+    """Decode a pagination cursor into (chapter_number, sort_order). Raises ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        chapter_number, sort_order = payload["n"], payload["o"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(chapter_number, (int, float)) or sort_order not in ("asc", "desc"):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return chapter_number, sort_order
 
 
 class ChapterRepository:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        index_cache: ChapterIndexCache = chapter_index_cache,
+        novel_cache: TTLCache = novel_cache,
+    ):
         self.db = db
         self.collection = self.db.chapters
+        self.novels_collection = self.db.novels
+        self.index_cache = index_cache
+        # Novel documents carry the chapter counters, so every counter write invalidates the cached novel
+        self.novel_cache = novel_cache
+
+    @staticmethod
+    def _to_chapters(
+        chapters: List[Dict[str, Any]], novel_id: Optional[PyObjectId] = None, model_class: Type[BaseModel] = Chapter
+    ) -> List[Any]:
+        """Convert chapter documents into models with one bulk validation.
+
+        When all documents belong to the same novel, pass its id so the stored string novel_id is
+        converted once instead of once per row.
+        """
+        if novel_id is not None and "novel_id" in model_class.model_fields:
+            novel_object_id = ObjectId(str(novel_id))
+            for chapter in chapters:
+                chapter["novel_id"] = novel_object_id
+        return list_adapter(model_class).validate_python(chapters)
+
+    async def _update_novel_counters(
+        self,
+        novel_id: PyObjectId,
+        total: int = 0,
+        read: int = 0,
+        downloaded: int = 0,
+        last_chapter_number: Optional[int] = None,
+        chapters_changed: bool = False,
+    ) -> None:
+        """Apply counter deltas to the novel document.
+
+        Novels whose counters were never initialised are left alone; they are filled in from the
+        chapters collection the next time they are read or reconciled.
+        """
+        update: Dict[str, Any] = {}
+        deltas = {"total_chapters": total, "read_chapters": read, "downloaded_chapters": downloaded}
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            update["$inc"] = deltas
+        if last_chapter_number is not None:
+            update["$max"] = {"last_chapter_number": last_chapter_number}
+        if chapters_changed:
+            update["$set"] = {"last_updated_chapters": datetime.utcnow()}
+        if not update:
+            return
+
+        await self.novels_collection.update_one(
+            {"_id": ObjectId(str(novel_id)), "total_chapters": {"$exists": True}}, update
+        )
+        self.novel_cache.invalidate(str(novel_id))
 
     async def create(self, chapter: ChapterCreate) -> Chapter:
         """Create a new chapter."""
@@ -20,8 +112,74 @@ class ChapterRepository:
         chapter_dict["last_updated"] = chapter_dict["added_at"]
 
         result = await self.collection.insert_one(chapter_dict)
-        created_chapter = await self.collection.find_one({"_id": result.inserted_id})
-        return Chapter(**created_chapter)
+        self.index_cache.invalidate(chapter_dict["novel_id"])
+        await self._update_novel_counters(
+            chapter_dict["novel_id"], total=1, last_chapter_number=chapter_dict["chapter_number"], chapters_changed=True
+        )
+        chapter_dict["_id"] = result.inserted_id
+        return Chapter(**chapter_dict)
+
+    async def bulk_upsert_chapters(self, novel_id: PyObjectId, chapters: List[ChapterCreate]) -> Dict[str, int]:
+        """Insert chapters that don't exist yet, keyed on (novel_id, chapter_number).
+
+        Writes are unordered upserts that never overwrite an existing chapter. Returns the number of
+        inserted and already existing (matched) chapters.
+        """
+        novel_id_str = str(novel_id)
+        now = datetime.utcnow()
+
+        # One operation per chapter number, otherwise parallel upserts on the same key would collide
+        chapters_by_number: Dict[int, ChapterCreate] = {}
+        for chapter in chapters:
+            chapters_by_number.setdefault(chapter.chapter_number, chapter)
+
+        chapter_numbers = list(chapters_by_number)
+        operations = []
+        for chapter_number, chapter in chapters_by_number.items():
+            chapter_dict = chapter.model_dump(exclude={"novel_id", "chapter_number"})
+            chapter_dict.update(read=False, downloaded=False, added_at=now, last_updated=now)
+            operations.append(
+                UpdateOne(
+                    {"novel_id": novel_id_str, "chapter_number": chapter_number},
+                    {"$setOnInsert": chapter_dict},
+                    upsert=True,
+                )
+            )
+
+        inserted = 0
+        matched = 0
+        last_inserted_number = None
+        for start in range(0, len(operations), BULK_WRITE_BATCH_SIZE):
+            batch = operations[start : start + BULK_WRITE_BATCH_SIZE]
+            try:
+                result = await self.collection.bulk_write(batch, ordered=False)
+                batch_matched = result.matched_count
+                upserted_indexes = list(result.upserted_ids.keys())
+            except BulkWriteError as e:
+                # A concurrent fetch may insert the same chapter first; that chapter already exists
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                    raise
+                batch_matched = e.details.get("nMatched", 0) + len(errors)
+                upserted_indexes = [upserted["index"] for upserted in e.details.get("upserted", [])]
+
+            inserted += len(upserted_indexes)
+            matched += batch_matched
+            for index in upserted_indexes:
+                chapter_number = chapter_numbers[start + index]
+                last_inserted_number = max(last_inserted_number or chapter_number, chapter_number)
+
+        if inserted:
+            self.index_cache.invalidate(novel_id)
+            await self._update_novel_counters(
+                novel_id, total=inserted, last_chapter_number=last_inserted_number, chapters_changed=True
+            )
+
+        return {"inserted": inserted, "matched": matched}
+
+    async def get_chapter_numbers(self, novel_id: PyObjectId) -> List[int]:
+        """Get the chapter numbers stored for a novel, without loading the chapters."""
+        return await self.collection.distinct("chapter_number", {"novel_id": str(novel_id)})
 
     async def get_by_id(self, chapter_id: PyObjectId) -> Optional[Chapter]:
         """Get a chapter by ID."""
@@ -29,24 +187,88 @@ class ChapterRepository:
         return Chapter(**chapter) if chapter else None
 
     async def get_by_novel_id(
-        self, novel_id: PyObjectId, skip: int = 0, limit: int = 100, sort_order: str = "desc"
-    ) -> tuple[List[Chapter], int]:
-        """Get all chapters for a novel and the total count."""
-        # Convert novel_id to string for comparison
-        novel_id_str = str(novel_id)
+        self,
+        novel_id: PyObjectId,
+        skip: int = 0,
+        limit: int = 100,
+        sort_order: str = "desc",
+        after: Optional[int] = None,
+        include_total: bool = False,
+        model_class: Type[BaseModel] = Chapter,
+    ) -> tuple[List[Any], Optional[int]]:
+        """Get the chapters for a novel, and their total count if include_total is set.
 
+        Passing `after` (a chapter number) continues from that chapter in sort order, which uses the
+        (novel_id, chapter_number) index instead of skipping over earlier pages. The total is None unless
+        include_total is set; callers that have the novel should read its total_chapters counter instead of
+        paying for the count query. With a lighter model_class such as ChapterSummary, only the fields of
+        that model are fetched.
+        """
         # Get total count
-        total = await self.collection.count_documents({"novel_id": novel_id_str})
+        total = await self.collection.count_documents({"novel_id": str(novel_id)}) if include_total else None
+
+        projection = None if model_class is Chapter else projection_for(model_class)
+        chapters = await self.get_documents_by_novel_id(
+            novel_id, skip=skip, limit=limit, sort_order=sort_order, after=after, projection=projection
+        )
+        return self._to_chapters(chapters, novel_id, model_class), total
+
+    async def get_documents_by_novel_id(
+        self,
+        novel_id: PyObjectId,
+        skip: int = 0,
+        limit: int = 100,
+        sort_order: str = "desc",
+        after: Optional[int] = None,
+        projection: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get the raw chapter documents for a novel, for callers that build their own models."""
+        # Convert novel_id to string for comparison
+        query: Dict[str, Any] = {"novel_id": str(novel_id)}
+        if after is not None:
+            query["chapter_number"] = {"$lt" if sort_order == "desc" else "$gt": after}
 
         # Get paginated chapters with sorting
         sort_direction = -1 if sort_order == "desc" else 1
-        cursor = self.collection.find({"novel_id": novel_id_str}).sort("chapter_number", sort_direction).skip(skip)
+        cursor = self.collection.find(query, projection).sort("chapter_number", sort_direction).skip(skip)
         if limit:
             cursor = cursor.limit(limit)
 
-        chapters = await cursor.to_list(length=limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_stats(self, novel_id: PyObjectId) -> Dict[str, Any]:
+        """Aggregate chapter counters for a novel on the server, without loading the chapters."""
+        stats_by_novel = await self.get_stats_for_novels([novel_id])
+        return stats_by_novel[str(novel_id)]
+
+    async def get_stats_for_novels(self, novel_ids: List[PyObjectId]) -> Dict[str, Dict[str, Any]]:
+        """Aggregate chapter counters for several novels in a single query, keyed by novel id string."""
+        novel_id_strs = [str(novel_id) for novel_id in novel_ids]
+        stats_by_novel = {
+            novel_id: {"total_chapters": 0, "read_chapters": 0, "downloaded_chapters": 0, "last_chapter_number": 0}
+            for novel_id in novel_id_strs
+        }
+        if not novel_id_strs:
+            return stats_by_novel
+
+        pipeline = [
+            {"$match": {"novel_id": {"$in": novel_id_strs}}},
+            {
+                "$group": {
+                    "_id": "$novel_id",
+                    "total_chapters": {"$sum": 1},
+                    "read_chapters": {"$sum": {"$cond": ["$read", 1, 0]}},
+                    "downloaded_chapters": {"$sum": {"$cond": ["$downloaded", 1, 0]}},
+                    "last_chapter_number": {"$max": "$chapter_number"},
+                }
+            },
+        ]
+        async for stats in self.collection.aggregate(pipeline):
+            novel_id = stats.pop("_id")
+            stats["last_chapter_number"] = stats["last_chapter_number"] or 0
+            stats_by_novel[novel_id] = stats
 
-        return [Chapter(**chapter) for chapter in chapters], total
+        return stats_by_novel
 
     async def get_by_number(self, novel_id: PyObjectId, chapter_number: int) -> Optional[Chapter]:
         """Get a chapter by its number for a specific novel."""
@@ -62,24 +284,150 @@ class ChapterRepository:
 
         update_data["last_updated"] = datetime.utcnow()
 
-        result = await self.collection.update_one({"_id": chapter_id}, {"$set": update_data})
+        # The previous version tells us which read/downloaded flags actually flipped
+        previous = await self.collection.find_one_and_update(
+            {"_id": chapter_id}, {"$set": update_data}, return_document=ReturnDocument.BEFORE
+        )
 
-        if result.matched_count == 0:
+        if previous is None:
             return None
 
-        updated_chapter = await self.collection.find_one({"_id": chapter_id})
-        return Chapter(**updated_chapter)
+        read_delta = self._flag_delta(previous, update_data, "read")
+        downloaded_delta = self._flag_delta(previous, update_data, "downloaded")
+        await self._update_novel_counters(previous["novel_id"], read=read_delta, downloaded=downloaded_delta)
+
+        return Chapter(**{**previous, **update_data})
+
+    @staticmethod
+    def _flag_delta(previous: Dict[str, Any], update_data: Dict[str, Any], field: str) -> int:
+        """Return +1/-1 when an update flips a boolean flag, 0 otherwise."""
+        if field not in update_data or update_data[field] is None:
+            return 0
+        return int(bool(update_data[field])) - int(bool(previous.get(field, False)))
 
     async def delete(self, chapter_id: PyObjectId) -> bool:
         """Delete a chapter."""
-        result = await self.collection.delete_one({"_id": chapter_id})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete({"_id": chapter_id})
+        if deleted is None:
+            return False
+
+        self.index_cache.invalidate(deleted["novel_id"])
+        await self._remove_from_novel_counters(deleted["novel_id"], [deleted])
+        return True
+
+    async def _remove_from_novel_counters(self, novel_id: PyObjectId, deleted: List[Dict[str, Any]]) -> None:
+        """Decrement the novel counters for deleted chapters and recompute the last chapter number."""
+        last_chapter = await self.collection.find_one(
+            {"novel_id": str(novel_id)}, {"chapter_number": 1}, sort=[("chapter_number", -1)]
+        )
+        await self.novels_collection.update_one(
+            {"_id": ObjectId(str(novel_id)), "total_chapters": {"$exists": True}},
+            {
+                "$inc": {
+                    "total_chapters": -len(deleted),
+                    "read_chapters": -sum(1 for chapter in deleted if chapter.get("read")),
+                    "downloaded_chapters": -sum(1 for chapter in deleted if chapter.get("downloaded")),
+                },
+                "$set": {
+                    "last_chapter_number": last_chapter["chapter_number"] if last_chapter else 0,
+                    "last_updated_chapters": datetime.utcnow(),
+                },
+            },
+        )
+        self.novel_cache.invalidate(str(novel_id))
 
     async def delete_by_novel_id(self, novel_id: PyObjectId) -> int:
         """Delete all chapters for a novel."""
-        result = await self.collection.delete_many({"novel_id": novel_id})
+        result = await self.collection.delete_many({"novel_id": str(novel_id)})
+        self.index_cache.invalidate(novel_id)
+        await self.novels_collection.update_one(
+            {"_id": ObjectId(str(novel_id))}, {"$set": {field: 0 for field in NOVEL_COUNTER_FIELDS}}
+        )
+        self.novel_cache.invalidate(str(novel_id))
         return result.deleted_count
 
+    async def clean_duplicates(
+        self,
+        batch_size: int = DUPLICATE_GROUPS_BATCH_SIZE,
+        on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    ) -> Dict[str, int]:
+        """Delete duplicate chapters, keeping the newest chapter of each (novel_id, chapter_number).
+
+        Duplicates are found with an aggregation, so only their ids and flags reach the server. The kept
+        chapter is marked read/downloaded if any of its duplicates was. Each batch of duplicate groups is
+        written with a single bulk_write. Returns the number of deleted chapters per novel id; the novel
+        counters are not touched and must be reconciled afterwards.
+        """
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {"novel_id": "$novel_id", "chapter_number": "$chapter_number"},
+                    "count": {"$sum": 1},
+                    "chapters": {
+                        "$push": {"_id": "$_id", "added_at": "$added_at", "read": "$read", "downloaded": "$downloaded"}
+                    },
+                }
+            },
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        deleted_by_novel: Dict[str, int] = {}
+        progress = {"groups_processed": 0, "chapters_deleted": 0}
+        batch: List[Dict[str, Any]] = []
+
+        async for group in self.collection.aggregate(pipeline, allowDiskUse=True):
+            batch.append(group)
+            if len(batch) >= batch_size:
+                await self._delete_duplicate_groups(batch, deleted_by_novel, progress)
+                batch = []
+                if on_progress:
+                    on_progress(progress)
+
+        if batch:
+            await self._delete_duplicate_groups(batch, deleted_by_novel, progress)
+        if on_progress:
+            on_progress(progress)
+
+        for novel_id in deleted_by_novel:
+            self.index_cache.invalidate(novel_id)
+        return deleted_by_novel
+
+    async def _delete_duplicate_groups(
+        self, groups: List[Dict[str, Any]], deleted_by_novel: Dict[str, int], progress: Dict[str, int]
+    ) -> None:
+        """Merge the flags into the chapter kept from each group and delete the others."""
+        keep_by_flags: Dict[tuple, List[ObjectId]] = {}
+        delete_ids = []
+        for group in groups:
+            # Newest first, like the chapter the source would return today
+            chapters = sorted(
+                group["chapters"],
+                key=lambda chapter: (chapter.get("added_at") or datetime.min, chapter["_id"]),
+                reverse=True,
+            )
+            flags = (
+                any(chapter.get("read") for chapter in chapters),
+                any(chapter.get("downloaded") for chapter in chapters),
+            )
+            if any(flags):
+                keep_by_flags.setdefault(flags, []).append(chapters[0]["_id"])
+            delete_ids.extend(chapter["_id"] for chapter in chapters[1:])
+
+            novel_id = group["_id"]["novel_id"]
+            deleted_by_novel[novel_id] = deleted_by_novel.get(novel_id, 0) + len(chapters) - 1
+
+        operations = [
+            UpdateMany(
+                {"_id": {"$in": chapter_ids}},
+                {"$set": {field: True for field, value in zip(("read", "downloaded"), flags) if value}},
+            )
+            for flags, chapter_ids in keep_by_flags.items()
+        ]
+        operations.append(DeleteMany({"_id": {"$in": delete_ids}}))
+        await self.collection.bulk_write(operations, ordered=False)
+
+        progress["groups_processed"] += len(groups)
+        progress["chapters_deleted"] += len(delete_ids)
+
     async def mark_as_read(self, chapter_id: PyObjectId) -> Optional[Chapter]:
         """Mark a chapter as read."""
         return await self.update(chapter_id, ChapterUpdate(read=True))
@@ -88,16 +436,30 @@ class ChapterRepository:
         """Mark a chapter as downloaded and set its local path."""
         return await self.update(chapter_id, ChapterUpdate(downloaded=True, local_path=local_path))
 
+    async def get_by_numbers(self, novel_id: PyObjectId, chapter_numbers: List[int]) -> List[Chapter]:
+        """Get the chapters of a novel with the given numbers, in chapter order. Missing numbers are skipped."""
+        index = await self.index_cache.get(self.collection, novel_id)
+        chapter_ids = [chapter_id for chapter_id in map(index.find, set(chapter_numbers)) if chapter_id]
+        return await self._get_by_ids(chapter_ids, novel_id)
+
+    async def _get_by_ids(self, chapter_ids: List[str], novel_id: PyObjectId) -> List[Chapter]:
+        if not chapter_ids:
+            return []
+        chapters = (
+            await self.collection.find({"_id": {"$in": [ObjectId(chapter_id) for chapter_id in chapter_ids]}})
+            .sort("chapter_number", 1)
+            .to_list(length=None)
+        )
+        return self._to_chapters(chapters, novel_id)
+
     async def get_next_chapter(self, novel_id: PyObjectId, current_chapter_number: int) -> Optional[Chapter]:
         """Get the next chapter after the current one."""
-        chapter = await self.collection.find_one(
-            {"novel_id": novel_id, "chapter_number": {"$gt": current_chapter_number}}, sort=[("chapter_number", 1)]
-        )
-        return Chapter(**chapter) if chapter else None
+        index = await self.index_cache.get(self.collection, novel_id)
+        chapter_id = index.next(current_chapter_number)
+        return await self.get_by_id(ObjectId(chapter_id)) if chapter_id else None
 
     async def get_previous_chapter(self, novel_id: PyObjectId, current_chapter_number: int) -> Optional[Chapter]:
         """Get the previous chapter before the current one."""
-        chapter = await self.collection.find_one(
-            {"novel_id": novel_id, "chapter_number": {"$lt": current_chapter_number}}, sort=[("chapter_number", -1)]
-        )
-        return Chapter(**chapter) if chapter else None
+        index = await self.index_cache.get(self.collection, novel_id)
+        chapter_id = index.previous(current_chapter_number)
+        return await self.get_by_id(ObjectId(chapter_id)) if chapter_id else None
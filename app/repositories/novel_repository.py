@@ -1,51 +1,159 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Type
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from app.models.novel import NovelInDB, NovelUpdate, NovelSummary, NovelDetail, NovelType, PyObjectId, NovelStats
-from app.repositories.chapter_repository import ChapterRepository
-from app.repositories.base_repository import BaseRepository
+from app.models.novel import Chapter as NovelChapter
+from app.repositories.chapter_repository import ChapterRepository, NOVEL_COUNTER_FIELDS
+from app.repositories.base_repository import BaseRepository, list_adapter, projection_for
+from app.repositories.cache import TTLCache, novel_cache
+from app.repositories.novel_search import NovelSearchIndex, novel_search_index
 
 
 class NovelRepository(BaseRepository[NovelInDB, NovelInDB, NovelUpdate]):
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        search_index: NovelSearchIndex = novel_search_index,
+        cache: TTLCache = novel_cache,
+    ):
         super().__init__(db, "novels", NovelInDB)
-        self.chapter_repository = ChapterRepository(db)
-
-    async def _calculate_novel_stats(self, novel_id: PyObjectId) -> NovelStats:
-        """Calculate statistics for a novel based on its chapters."""
-        chapters, _ = await self.chapter_repository.get_by_novel_id(novel_id, limit=None)
-        total_chapters = len(chapters)
-        last_chapter_number = max(chapter.chapter_number for chapter in chapters) if chapters else 0
-        read_chapters = sum(1 for chapter in chapters if chapter.read)
-        downloaded_chapters = sum(1 for chapter in chapters if chapter.downloaded)
+        self.chapter_repository = ChapterRepository(db, novel_cache=cache)
+        self.search_index = search_index
+        self.cache = cache
+
+    def _build_document(self, item: NovelInDB) -> Dict[str, Any]:
+        """Build the novel document, starting with empty chapter counters."""
+        novel_dict = super()._build_document(item)
+        novel_dict.update({field: 0 for field in NOVEL_COUNTER_FIELDS})
+        novel_dict["last_updated_chapters"] = None
+        return novel_dict
+
+    def _build_novel_stats(self, stats: Dict[str, Any]) -> NovelStats:
+        """Build NovelStats from the chapter counters of a novel."""
+        total_chapters = stats["total_chapters"]
+        read_chapters = stats["read_chapters"]
         reading_progress = (read_chapters / total_chapters * 100) if total_chapters > 0 else 0
 
         return NovelStats(
             total_chapters=total_chapters,
-            last_chapter_number=last_chapter_number,
+            last_chapter_number=stats["last_chapter_number"] or 0,
             read_chapters=read_chapters,
-            downloaded_chapters=downloaded_chapters,
+            downloaded_chapters=stats["downloaded_chapters"],
             reading_progress=reading_progress,
-            last_updated_chapters=datetime.utcnow() if chapters else None,
+            last_updated_chapters=stats.get("last_updated_chapters"),
         )
 
+    async def _calculate_novel_stats(self, novel_id: PyObjectId) -> NovelStats:
+        """Calculate statistics for a novel based on its chapters."""
+        stats = await self.chapter_repository.get_stats(novel_id)
+        return self._build_novel_stats(stats)
+
+    async def _ensure_counters(self, novels: List[Dict[str, Any]]) -> None:
+        """Fill in the counters of novel documents stored before counters were maintained."""
+        missing = [novel for novel in novels if not all(field in novel for field in NOVEL_COUNTER_FIELDS)]
+        if not missing:
+            return
+
+        stats_by_novel = await self.reconcile_counters([novel["_id"] for novel in missing])
+        for novel in missing:
+            novel.update(stats_by_novel[str(novel["_id"])])
+
+    async def reconcile_counters(self, novel_ids: Optional[List[PyObjectId]] = None) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the chapter counters of the given novels (all novels if None) from the chapters collection."""
+        if novel_ids is None:
+            novel_ids = await self.collection.distinct("_id")
+
+        stats_by_novel = await self.chapter_repository.get_stats_for_novels(novel_ids)
+        now = datetime.utcnow()
+        operations = []
+        for novel_id in novel_ids:
+            stats = stats_by_novel[str(novel_id)]
+            stats["last_updated_chapters"] = now if stats["total_chapters"] else None
+            operations.append(UpdateOne({"_id": novel_id}, {"$set": stats}))
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        for novel_id in novel_ids:
+            self.cache.invalidate(str(novel_id))
+        return stats_by_novel
+
+    async def clean_duplicate_chapters(
+        self, on_progress: Optional[Callable[[Dict[str, int]], None]] = None
+    ) -> Dict[str, Any]:
+        """Delete duplicate chapters across all novels and reconcile the counters of the affected novels."""
+        deleted_by_novel = await self.chapter_repository.clean_duplicates(on_progress=on_progress)
+
+        novel_ids = [ObjectId(novel_id) for novel_id in deleted_by_novel if ObjectId.is_valid(novel_id)]
+        stats_by_novel = await self.reconcile_counters(novel_ids) if novel_ids else {}
+        novels = await self.collection.find({"_id": {"$in": novel_ids}}, {"title": 1}).to_list(length=None)
+        titles = {str(novel["_id"]): novel.get("title") for novel in novels}
+
+        total_deleted = sum(deleted_by_novel.values())
+        return {
+            "message": f"Cleaned up {total_deleted} duplicate chapters across {len(deleted_by_novel)} novels",
+            "total_deleted": total_deleted,
+            "results": [
+                {
+                    "novel_id": novel_id,
+                    "novel_title": titles.get(novel_id),
+                    "deleted_count": deleted_count,
+                    "remaining_chapters": stats_by_novel.get(novel_id, {}).get("total_chapters"),
+                }
+                for novel_id, deleted_count in deleted_by_novel.items()
+            ],
+        }
+
     async def filter(
-        self, query: Dict[str, Any], skip: int = 0, limit: int = 100, return_summary: bool = True
+        self,
+        query: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+        model_class: Optional[Type[BaseModel]] = NovelSummary,
     ) -> List[NovelSummary]:
-        """Filter novels by query parameters."""
-        novels = await super().filter(query, skip, limit)
-        return [await self._create_novel_summary(novel) for novel in novels]
+        """Filter novels by query parameters, fetching only the fields of model_class.
+
+        Novels are returned as NovelSummary by default, with their stats built from the chapter counters.
+        """
+        if model_class is not NovelSummary:
+            return await super().filter(query, skip=skip, limit=limit, model_class=model_class)
+
+        # The counters are NovelStats fields, so the projection keeps what _ensure_counters checks
+        novels = (
+            await self.collection.find(query, projection_for(NovelSummary))
+            .skip(skip)
+            .limit(limit)
+            .to_list(length=limit)
+        )
+        await self._ensure_counters(novels)
+        summaries = [{**novel, **self._build_novel_stats(novel).model_dump()} for novel in novels]
+        return list_adapter(NovelSummary).validate_python(summaries)
 
-    async def _create_novel_summary(self, novel: NovelInDB) -> NovelSummary:
-        """Create a NovelSummary from a novel document."""
-        stats = await self._calculate_novel_stats(novel.id)
-        novel_dict = novel.model_dump(by_alias=True)
-        return NovelSummary(**novel_dict, **stats.model_dump())
+    async def search(
+        self, text: str, filters: Optional[Dict[str, Any]] = None, skip: int = 0, limit: int = 100
+    ) -> List[NovelSummary]:
+        """Search novels by title, author and description, best match first.
+
+        Matching is accent-insensitive and query words also match as prefixes. filters may hold exact
+        values for type, status and source_name.
+        """
+        # The index is shared by the whole process, so it is built from the primary like the caches
+        await self.search_index.ensure_built(self.primary_collection)
+        novel_ids = self.search_index.search(text, filters)[skip : skip + limit]
+        if not novel_ids:
+            return []
+
+        novels = await self.filter(
+            {"_id": {"$in": [ObjectId(novel_id) for novel_id in novel_ids]}}, limit=len(novel_ids)
+        )
+        rank = {novel_id: position for position, novel_id in enumerate(novel_ids)}
+        return sorted(novels, key=lambda novel: rank[str(novel.id)])
 
     async def exists_by_source_url(self, source_url: str) -> bool:
         """Check if a novel exists with the given source URL."""
-        novels = await self.filter({"source_url": source_url}, limit=1)
-        return len(novels) > 0
+        return await self.collection.find_one({"source_url": source_url}, {"_id": 1}) is not None
 
     async def get_all(self, skip: int = 0, limit: int = 100, type: Optional[NovelType] = None) -> List[NovelSummary]:
         """Get all novels with summary information."""
@@ -54,19 +162,53 @@ class NovelRepository(BaseRepository[NovelInDB, NovelInDB, NovelUpdate]):
             query["type"] = type
         return await self.filter(query, skip=skip, limit=limit)
 
-    async def get_by_id(self, novel_id: PyObjectId) -> Optional[NovelDetail]:
-        """Get a novel by ID with detailed information."""
-        novel = await super().get_by_id(novel_id)
+    async def create(self, item: NovelInDB) -> NovelDetail:
+        """Create a novel. A new novel has no chapters, so the detail is built without reading it back."""
+        novel = await super().create(item)
+        self.search_index.upsert(novel.model_dump(by_alias=True))
+        stats = self._build_novel_stats({field: 0 for field in NOVEL_COUNTER_FIELDS})
+        return NovelDetail(**novel.model_dump(by_alias=True), **stats.model_dump(), chapters=[])
+
+    async def get_by_id(self, novel_id: PyObjectId, include_chapters: bool = True) -> Optional[NovelDetail]:
+        """Get a novel by ID with detailed information.
+
+        Stats come from the counters on the novel document, so with include_chapters=False this is a
+        single document fetch, served from the novel cache when possible.
+        """
+        novel = await self.get_document(novel_id)
         if not novel:
             return None
 
-        chapters, _ = await self.chapter_repository.get_by_novel_id(novel_id)
-        stats = await self._calculate_novel_stats(novel_id)
+        return await self._build_novel_detail(novel, include_chapters)
+
+    async def get_document(self, novel_id: PyObjectId) -> Optional[Dict[str, Any]]:
+        """Get the raw novel document, with its counters filled in, through the novel cache.
+
+        The document may be shared with other callers and must not be modified. It is always loaded
+        from the primary, even through a repository with the list read preference.
+        """
 
-        # Convertir los capítulos a diccionarios
-        chapters_dict = [chapter.model_dump(by_alias=True) for chapter in chapters]
+        async def load() -> Optional[Dict[str, Any]]:
+            novel = await self.primary_collection.find_one({"_id": ObjectId(str(novel_id))})
+            if novel:
+                await self._ensure_counters([novel])
+            return novel
 
-        return NovelDetail(**novel.model_dump(by_alias=True), **stats.model_dump(), chapters=chapters_dict)
+        return await self.cache.get_or_load(str(novel_id), load)
+
+    async def _build_novel_detail(self, novel: Dict[str, Any], include_chapters: bool = True) -> NovelDetail:
+        """Build a NovelDetail from a novel document."""
+        await self._ensure_counters([novel])
+        stats = self._build_novel_stats(novel)
+
+        chapters = None
+        if include_chapters:
+            # Only the fields embedded in NovelDetail are fetched, and they are validated once, as part of it
+            chapters = await self.chapter_repository.get_documents_by_novel_id(
+                novel["_id"], projection=projection_for(NovelChapter)
+            )
+
+        return NovelDetail.model_validate({**novel, **stats.model_dump(), "chapters": chapters})
 
     async def update_metadata(self, novel_id: PyObjectId, novel_info: dict) -> Optional[NovelDetail]:
         """Update the metadata of a novel."""
@@ -84,9 +226,29 @@ class NovelRepository(BaseRepository[NovelInDB, NovelInDB, NovelUpdate]):
         if update_data["cover_image_url"]:
             update_data["cover_image_url"] = str(update_data["cover_image_url"])
 
-        result = await self.collection.update_one({"_id": novel_id}, {"$set": update_data})
+        novel = await self.collection.find_one_and_update(
+            {"_id": novel_id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
 
-        if result.matched_count == 0:
+        if novel is None:
             return None
 
-        return await self.get_by_id(novel_id)
+        self.cache.invalidate(str(novel_id))
+        self.search_index.upsert(novel)
+        return await self._build_novel_detail(novel)
+
+    async def update(self, novel_id: PyObjectId, novel_update: NovelUpdate) -> Optional[NovelInDB]:
+        """Update a novel."""
+        novel = await super().update(novel_id, novel_update)
+        if novel is not None:
+            self.cache.invalidate(str(novel_id))
+            self.search_index.upsert(novel.model_dump(by_alias=True))
+        return novel
+
+    async def delete(self, novel_id: PyObjectId) -> bool:
+        """Delete a novel."""
+        deleted = await super().delete(novel_id)
+        if deleted:
+            self.cache.invalidate(str(novel_id))
+            self.search_index.remove(novel_id)
+        return deleted
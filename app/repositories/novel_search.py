@@ -0,0 +1,204 @@
+import asyncio
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.core.config import settings
+
+# Weight of a match in each indexed field
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "description": 1.0}
+# A query term that is only a prefix of an indexed word scores this fraction of a whole-word match
+PREFIX_MATCH_FACTOR = 0.5
+# Shorter query terms only match whole words; a one-letter prefix matches most of the library
+MIN_PREFIX_LENGTH = 2
+# Fields kept in memory so that list filters can be applied before touching the database
+FILTER_FIELDS = ("type", "status", "source_name")
+# Novels tokenized between two yields to the event loop while building
+BUILD_CHUNK_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r"\w+")
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip accents, so that "Señor" and "senor" compare equal."""
+    if text.isascii():
+        return text.lower()
+    return COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    return set(TOKEN_PATTERN.findall(normalize(text))) if text else set()
+
+
+class NovelSearchIndex:
+    """Process-local inverted index over novel titles, authors and descriptions.
+
+    Words are indexed accent-insensitively. Every query term must match a word of the novel, either
+    whole or as a prefix, which is looked up by bisecting the sorted vocabulary.
+
+    A full build stores the postings of each word as a compact array of document numbers. Novels
+    written afterwards go to a small overlay and their previous document number is marked as removed;
+    the overlay is folded in by the next full build, which happens every NOVEL_SEARCH_REFRESH_SECONDS
+    and also picks up writes made by other processes.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._built_at: Optional[float] = None
+        self._writes_during_build = False
+        self._building = False
+        self._build_lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Dict[str, array]] = {field: {} for field in FIELD_WEIGHTS}
+        self._vocabulary: List[str] = []
+        self._overlay: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELD_WEIGHTS}
+        self._documents: Dict[int, Dict[str, Any]] = {}  # document number -> novel id, filter fields, sort key
+        self._numbers: Dict[str, int] = {}  # novel id -> current document number
+        self._removed: Set[int] = set()
+        self._next_number = 0
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def invalidate(self) -> None:
+        """Forget the index; it is rebuilt on the next search."""
+        self._reset()
+        self._built_at = None
+
+    async def ensure_built(self, collection: AsyncIOMotorCollection) -> None:
+        """Build the index if it was never built or is older than the refresh interval."""
+        if self.is_built and time.monotonic() - self._built_at < self.refresh_seconds:
+            return
+
+        async with self._build_lock:
+            if self.is_built and time.monotonic() - self._built_at < self.refresh_seconds:
+                return
+            await self._build(collection)
+
+    async def _build(self, collection: AsyncIOMotorCollection) -> None:
+        projection = {field: 1 for field in (*FIELD_WEIGHTS, *FILTER_FIELDS)}
+        # Writes are tracked until the build is complete: tokenizing yields to the event loop too
+        self._building = True
+        self._writes_during_build = False
+        try:
+            novels = await collection.find({}, projection).to_list(length=None)
+
+            self._reset()
+            postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in FIELD_WEIGHTS}
+            for position, novel in enumerate(novels, 1):
+                if position % BUILD_CHUNK_SIZE == 0:
+                    await asyncio.sleep(0)
+                number = self._register(novel)
+                for field, words in self._words_by_field(novel):
+                    field_postings = postings[field]
+                    for word in words:
+                        field_postings.setdefault(word, []).append(number)
+
+            self._postings = {
+                field: {word: array("I", numbers) for word, numbers in field_postings.items()}
+                for field, field_postings in postings.items()
+            }
+            self._vocabulary = sorted(set().union(*postings.values()))
+            # A write that raced the build may be missing from it or indexed twice; rebuild on the next search
+            self._built_at = float("-inf") if self._writes_during_build else time.monotonic()
+        finally:
+            self._building = False
+
+    def _register(self, novel: Dict[str, Any]) -> int:
+        number = self._next_number
+        self._next_number += 1
+        novel_id = str(novel["_id"])
+        self._numbers[novel_id] = number
+        self._documents[number] = {
+            "id": novel_id,
+            "sort_key": normalize(novel.get("title") or ""),
+            **{field: novel.get(field) for field in FILTER_FIELDS},
+        }
+        return number
+
+    @staticmethod
+    def _words_by_field(novel: Dict[str, Any]) -> Iterable[Tuple[str, Set[str]]]:
+        return ((field, tokenize(novel.get(field))) for field in FIELD_WEIGHTS)
+
+    def upsert(self, novel: Dict[str, Any]) -> None:
+        """Index a created or updated novel document."""
+        if self._building:
+            self._writes_during_build = True
+        if not self.is_built:
+            return
+
+        self.remove(novel["_id"])
+        number = self._register(novel)
+        for field, words in self._words_by_field(novel):
+            for word in words:
+                self._overlay[field].setdefault(word, set()).add(number)
+
+    def remove(self, novel_id: Any) -> None:
+        """Drop a novel from the index."""
+        if self._building:
+            self._writes_during_build = True
+        number = self._numbers.pop(str(novel_id), None)
+        if number is not None:
+            self._removed.add(number)
+            del self._documents[number]
+
+    def _matching_words(self, term: str) -> List[Tuple[str, float]]:
+        """Return the indexed words matching a query term with the factor of each match."""
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [(term, 1.0)]
+
+        matches = []
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            matches.append(self._vocabulary[position])
+            position += 1
+        # The overlay only holds the novels written since the last build
+        matches.extend(word for field in self._overlay.values() for word in field if word.startswith(term))
+        return [(word, 1.0 if word == term else PREFIX_MATCH_FACTOR) for word in set(matches)]
+
+    def _score_term(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for word, factor in self._matching_words(term):
+            for field, weight in FIELD_WEIGHTS.items():
+                score = weight * factor
+                for postings in (self._postings[field].get(word, ()), self._overlay[field].get(word, ())):
+                    for number in postings:
+                        if scores.get(number, 0.0) < score:
+                            scores[number] = score
+        return scores
+
+    def search(self, text: str, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Return the ids of the novels matching every term of text, best match first."""
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        # Rarest terms first, so the candidate set is as small as possible from the start
+        term_scores = sorted((self._score_term(term) for term in terms), key=len)
+        scores = term_scores[0]
+        for other in term_scores[1:]:
+            if not scores:
+                return []
+            scores = {number: score + other[number] for number, score in scores.items() if number in other}
+        if not scores:
+            return []
+
+        documents = self._documents
+        matches = [
+            number
+            for number in scores
+            if number not in self._removed
+            and (not filters or all(documents[number].get(field) == value for field, value in filters.items()))
+        ]
+        matches.sort(key=lambda number: (-scores[number], documents[number]["sort_key"]))
+        return [documents[number]["id"] for number in matches]
+
+
+novel_search_index = NovelSearchIndex(settings.NOVEL_SEARCH_REFRESH_SECONDS)
@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from app.core.config import settings
+
+ProgressKey = Tuple[str, str]  # (user_id, chapter_id)
+
+
+class ReadingProgressBuffer:
+    """In-process write-behind buffer for reading progress.
+
+    Keeps only the latest progress per (user_id, chapter_id) and writes everything with a single
+    unordered bulk_write every flush_interval seconds and at shutdown. Reads check the buffer first so
+    callers always see their own writes.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Dict[ProgressKey, Dict[str, Any]] = {}
+        self._flushing: Dict[ProgressKey, Dict[str, Any]] = {}
+        self._collection = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Start the periodic flush task."""
+        self._collection = db.reading_progress
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task and write whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error flushing reading progress: {e}")
+
+    def add(self, progress: Dict[str, Any]) -> Dict[str, Any]:
+        """Buffer a progress document, replacing any older one for the same user and chapter."""
+        key = (progress["user_id"], progress["chapter_id"])
+        previous = self._pending.get(key) or self._flushing.get(key)
+        if previous:
+            # Keep the id stable while the entry is buffered
+            progress["_id"] = previous["_id"]
+        self._pending[key] = progress
+        return progress
+
+    def get(self, user_id: str, chapter_id: str) -> Optional[Dict[str, Any]]:
+        """Get the buffered progress for a user and chapter, if any."""
+        key = (user_id, chapter_id)
+        return self._pending.get(key) or self._flushing.get(key)
+
+    def get_for_user(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get every buffered progress entry for a user."""
+        entries = {**self._flushing, **self._pending}
+        return [progress for (entry_user_id, _), progress in entries.items() if entry_user_id == user_id]
+
+    def discard(self, user_id: str, chapter_id: str) -> None:
+        """Drop a buffered entry, e.g. when the progress is deleted."""
+        self._pending.pop((user_id, chapter_id), None)
+        self._flushing.pop((user_id, chapter_id), None)
+
+    async def flush(self) -> int:
+        """Write all pending progress with one bulk_write. Returns the number of entries written."""
+        async with self._flush_lock:
+            if not self._pending or self._collection is None:
+                return 0
+
+            self._flushing, self._pending = self._pending, {}
+            operations = []
+            for progress in self._flushing.values():
+                fields = {key: value for key, value in progress.items() if key != "_id"}
+                operations.append(
+                    UpdateOne(
+                        {"user_id": progress["user_id"], "chapter_id": progress["chapter_id"]},
+                        {"$set": fields, "$setOnInsert": {"_id": progress["_id"]}},
+                        upsert=True,
+                    )
+                )
+
+            try:
+                await self._collection.bulk_write(operations, ordered=False)
+            except Exception:
+                # Put back whatever wasn't superseded by a newer write, so it is retried next time
+                for key, progress in self._flushing.items():
+                    self._pending.setdefault(key, progress)
+                raise
+            finally:
+                self._flushing = {}
+
+            return len(operations)
+
+
+reading_progress_buffer = ReadingProgressBuffer(settings.READING_PROGRESS_FLUSH_INTERVAL)
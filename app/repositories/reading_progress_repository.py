@@ -1,60 +1,98 @@
 from typing import Optional
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from app.models.chapter import ReadingProgress, ReadingProgressCreate, PyObjectId
+from app.repositories.base_repository import list_adapter
+from app.repositories.progress_buffer import ReadingProgressBuffer
 
 
 class ReadingProgressRepository:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, buffer: Optional[ReadingProgressBuffer] = None):
         self.db = db
         self.collection = self.db.reading_progress
+        self.buffer = buffer
+
+    async def _stored_id(self, user_id: str, chapter_id: str) -> PyObjectId:
+        """Id of the progress for a user and chapter: buffered, stored, or a new one for the flush to insert."""
+        buffered = self.buffer.get(user_id, chapter_id)
+        if buffered:
+            return buffered["_id"]
+        stored = await self.collection.find_one({"user_id": user_id, "chapter_id": chapter_id}, {"_id": 1})
+        return stored["_id"] if stored else PyObjectId()
 
     async def create_or_update(self, progress: ReadingProgressCreate) -> ReadingProgress:
-        """Create or update reading progress for a user and chapter."""
+        """Create or update reading progress for a user and chapter.
+
+        When the write-behind buffer is running the write is coalesced there and flushed later.
+        """
         # Convert IDs to strings for MongoDB
         user_id_str = str(progress.user_id)
         chapter_id_str = str(progress.chapter_id)
 
-        # Try to find existing progress
-        existing = await self.collection.find_one({"user_id": user_id_str, "chapter_id": chapter_id_str})
+        fields = {"progress": progress.progress, "last_updated": datetime.utcnow()}
+        if progress.novel_id is not None:
+            fields["novel_id"] = str(progress.novel_id)
+        if progress.chapter_number is not None:
+            fields["chapter_number"] = progress.chapter_number
 
-        if existing:
-            # Update existing progress
-            result = await self.collection.update_one(
-                {"_id": existing["_id"]}, {"$set": {"progress": progress.progress, "last_updated": datetime.utcnow()}}
+        if self.buffer is not None and self.buffer.is_running:
+            buffered = self.buffer.add(
+                {
+                    "_id": await self._stored_id(user_id_str, chapter_id_str),
+                    "user_id": user_id_str,
+                    "chapter_id": chapter_id_str,
+                    **fields,
+                }
             )
-            updated = await self.collection.find_one({"_id": existing["_id"]})
-            return ReadingProgress(**updated)
-        else:
-            # Create new progress
-            progress_dict = progress.model_dump()
-            progress_dict["user_id"] = user_id_str
-            progress_dict["chapter_id"] = chapter_id_str
-            progress_dict["last_updated"] = datetime.utcnow()
-
-            result = await self.collection.insert_one(progress_dict)
-            created = await self.collection.find_one({"_id": result.inserted_id})
-            return ReadingProgress(**created)
+            return ReadingProgress(**buffered)
+
+        # Upsert and read back in a single round trip
+        updated = await self.collection.find_one_and_update(
+            {"user_id": user_id_str, "chapter_id": chapter_id_str},
+            {"$set": fields},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return ReadingProgress(**updated)
 
     async def get_progress(self, user_id: PyObjectId, chapter_id: PyObjectId) -> Optional[ReadingProgress]:
         """Get reading progress for a specific user and chapter."""
+        if self.buffer is not None:
+            buffered = self.buffer.get(str(user_id), str(chapter_id))
+            if buffered:
+                return ReadingProgress(**buffered)
+
         progress = await self.collection.find_one({"user_id": str(user_id), "chapter_id": str(chapter_id)})
         return ReadingProgress(**progress) if progress else None
 
     async def get_user_progress(self, user_id: PyObjectId, novel_id: PyObjectId) -> list[ReadingProgress]:
-        """Get all reading progress for a user in a specific novel."""
-        # First get all chapter IDs for the novel
-        chapters = await self.db.chapters.find({"novel_id": str(novel_id)}, {"_id": 1}).to_list(length=None)
+        """Get all reading progress for a user in a specific novel, sorted by chapter number."""
+        # novel_id and chapter_number are stored on each progress document, so this is one indexed query
+        cursor = self.collection.find({"user_id": str(user_id), "novel_id": str(novel_id)}).sort("chapter_number", 1)
 
-        chapter_ids = [str(chapter["_id"]) for chapter in chapters]
+        progress_list = await cursor.to_list(length=None)
 
-        # Then get all progress for these chapters
-        cursor = self.collection.find({"user_id": str(user_id), "chapter_id": {"$in": chapter_ids}})
+        if self.buffer is not None:
+            # Buffered writes are newer than what is stored
+            progress_by_chapter = {progress["chapter_id"]: progress for progress in progress_list}
+            buffered_progress = [
+                buffered
+                for buffered in self.buffer.get_for_user(str(user_id))
+                if buffered.get("novel_id") == str(novel_id)
+            ]
+            if buffered_progress:
+                for buffered in buffered_progress:
+                    progress_by_chapter[buffered["chapter_id"]] = buffered
+                progress_list = sorted(
+                    progress_by_chapter.values(), key=lambda progress: progress.get("chapter_number") or 0
+                )
 
-        progress_list = await cursor.to_list(length=None)
-        return [ReadingProgress(**progress) for progress in progress_list]
+        return list_adapter(ReadingProgress).validate_python(progress_list)
 
     async def delete_progress(self, user_id: PyObjectId, chapter_id: PyObjectId) -> bool:
         """Delete reading progress for a specific user and chapter."""
+        if self.buffer is not None:
+            self.buffer.discard(str(user_id), str(chapter_id))
         result = await self.collection.delete_one({"user_id": str(user_id), "chapter_id": str(chapter_id)})
         return result.deleted_count > 0
@@ -3,21 +3,26 @@ from bson import ObjectId
 from app.models.source import SourceInDB, SourceCreate, SourceUpdate
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from app.repositories.base_repository import BaseRepository
+from app.repositories.cache import TTLCache, source_cache
 
 
 class SourceRepository(BaseRepository[SourceInDB, SourceCreate, SourceUpdate]):
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, cache: TTLCache = source_cache):
         super().__init__(db, "sources", SourceInDB)
+        self.cache = cache
 
     async def get_all(self) -> List[SourceInDB]:
         """Get all sources."""
         sources = await self.collection.find().to_list(length=None)
-        return [SourceInDB(**source) for source in sources]
+        return self._to_models(sources)
 
     async def get_by_id(self, source_id: str) -> Optional[SourceInDB]:
-        """Get a source by ID."""
-        source = await self.collection.find_one({"_id": ObjectId(source_id)})
+        """Get a source by ID, through the source cache."""
+        source = await self.cache.get_or_load(
+            str(source_id), lambda: self.primary_collection.find_one({"_id": ObjectId(source_id)})
+        )
         return SourceInDB(**source) if source else None
 
     async def get_by_name(self, name: str) -> Optional[SourceInDB]:
@@ -32,24 +37,24 @@ class SourceRepository(BaseRepository[SourceInDB, SourceCreate, SourceUpdate]):
         source_dict["updated_at"] = source_dict["created_at"]
 
         result = await self.collection.insert_one(source_dict)
-        created_source = await self.collection.find_one({"_id": result.inserted_id})
-        return SourceInDB(**created_source)
+        source_dict["_id"] = result.inserted_id
+        return SourceInDB(**source_dict)
 
     async def update(self, source_id: str, source: SourceUpdate) -> Optional[SourceInDB]:
         """Update a source."""
         update_data = source.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
 
-        result = await self.collection.update_one({"_id": ObjectId(source_id)}, {"$set": update_data})
-
-        if result.modified_count:
-            updated_source = await self.collection.find_one({"_id": ObjectId(source_id)})
-            return SourceInDB(**updated_source)
-        return None
+        updated_source = await self.collection.find_one_and_update(
+            {"_id": ObjectId(source_id)}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
+        self.cache.invalidate(str(source_id))
+        return SourceInDB(**updated_source) if updated_source else None
 
     async def delete(self, source_id: str) -> bool:
         """Delete a source."""
         result = await self.collection.delete_one({"_id": ObjectId(source_id)})
+        self.cache.invalidate(str(source_id))
         return result.deleted_count > 0
 
     async def seed_sources(self, sources: List[SourceCreate]) -> List[SourceInDB]:
@@ -1,41 +1,61 @@
 from typing import Optional
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from app.models.user import UserInDB, UserCreate, UserUpdate, PyObjectId
-from passlib.context import CryptContext
+from app.core.security import PasswordHasher, password_hasher
+from app.repositories.cache import PrincipalCache, TTLCache, principal_cache, user_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address, stored as email_normalized for exact indexed lookups."""
+    return email.strip().lower()
 
 
 class UserRepository:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        cache: TTLCache = user_cache,
+        principals: PrincipalCache = principal_cache,
+        hasher: PasswordHasher = password_hasher,
+    ):
         self.db = db
         self.collection = self.db.users
+        self.cache = cache
+        self.principals = principals
+        self.hasher = hasher
+
+    def _invalidate(self, user_id: PyObjectId) -> None:
+        """Drop a written user from the user cache and from the principals of all their tokens."""
+        self.cache.invalidate(str(user_id))
+        self.principals.invalidate_user(user_id)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
     async def create(self, user: UserCreate) -> UserInDB:
         """Create a new user."""
         user_dict = user.model_dump(exclude={"password"})
-        user_dict["hashed_password"] = self.get_password_hash(user.password)
+        user_dict["hashed_password"] = await self.get_password_hash(user.password)
+        user_dict["email_normalized"] = normalize_email(user.email)
         user_dict["created_at"] = datetime.utcnow()
 
         result = await self.collection.insert_one(user_dict)
-        created = await self.collection.find_one({"_id": result.inserted_id})
-        return UserInDB(**created)
+        user_dict["_id"] = result.inserted_id
+        return UserInDB(**user_dict)
 
     async def get_by_id(self, user_id: PyObjectId) -> Optional[UserInDB]:
-        """Get a user by ID."""
-        user = await self.collection.find_one({"_id": user_id})
+        """Get a user by ID, through the user cache."""
+        user = await self.cache.get_or_load(str(user_id), lambda: self.collection.find_one({"_id": user_id}))
         return UserInDB(**user) if user else None
 
     async def get_by_email(self, email: str) -> Optional[UserInDB]:
-        """Get a user by email."""
-        user = await self.collection.find_one({"email": {"$regex": email, "$options": "i"}})
+        """Get a user by email, case-insensitively."""
+        user = await self.collection.find_one({"email_normalized": normalize_email(email)})
         return UserInDB(**user) if user else None
 
     async def get_by_username(self, username: str) -> Optional[UserInDB]:
@@ -49,22 +69,23 @@ class UserRepository:
         update_data = user_update.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = self.get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await self.get_password_hash(update_data.pop("password"))
+        if update_data.get("email"):
+            update_data["email_normalized"] = normalize_email(update_data["email"])
 
         if not update_data:
             return None
 
-        result = await self.collection.update_one({"_id": user_id}, {"$set": update_data})
-
-        if result.matched_count == 0:
-            return None
-
-        updated = await self.collection.find_one({"_id": user_id})
-        return UserInDB(**updated)
+        updated = await self.collection.find_one_and_update(
+            {"_id": user_id}, {"$set": update_data}, return_document=ReturnDocument.AFTER
+        )
+        self._invalidate(user_id)
+        return UserInDB(**updated) if updated else None
 
     async def update_last_login(self, user_id: PyObjectId) -> None:
         """Update the last login timestamp for a user."""
         await self.collection.update_one({"_id": user_id}, {"$set": {"last_login": datetime.utcnow()}})
+        self._invalidate(user_id)
 
     async def authenticate(self, user: str, password: str) -> Optional[UserInDB]:
         """Authenticate a user."""
@@ -74,21 +95,20 @@ class UserRepository:
             user = await self.get_by_username(user)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             return None
         return user
 
     async def delete(self, user_id: PyObjectId) -> bool:
         """Delete a user."""
         result = await self.collection.delete_one({"_id": user_id})
+        self._invalidate(user_id)
         return result.deleted_count > 0
 
     async def update_preferences(self, user_id: PyObjectId, preferences: dict) -> Optional[UserInDB]:
         """Update user preferences."""
-        result = await self.collection.update_one({"_id": user_id}, {"$set": {"preferences": preferences}})
-
-        if result.matched_count == 0:
-            return None
-
-        updated = await self.collection.find_one({"_id": user_id})
-        return UserInDB(**updated)
+        updated = await self.collection.find_one_and_update(
+            {"_id": user_id}, {"$set": {"preferences": preferences}}, return_document=ReturnDocument.AFTER
+        )
+        self._invalidate(user_id)
+        return UserInDB(**updated) if updated else None
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.models.user import Token, RefreshTokenRequest, UserPublic, UserInDB
+from app.models.user import Token, RefreshTokenRequest, UserPublic, UserInDB, UserUpdate
 from app.dependencies.auth import get_auth_service, get_current_user
 from app.services.core.auth_service import AuthService
 
@@ -39,7 +39,7 @@ async def logout(
 ):
     try:
         # Clear refresh token from user
-        user_update = {"refresh_token": None, "refresh_token_expires": None}
+        user_update = UserUpdate(refresh_token=None, refresh_token_expires=None)
         await auth_service.user_repository.update(current_user.id, user_update)
     except Exception:
         raise HTTPException(
@@ -1,4 +1,11 @@
+from app.core.security import password_hasher
+from app.db.database import db_manager
+from app.db.indexes import failed_indexes
+from app.repositories.cache import repository_caches
 from app.routers.base import BaseRouter
+from app.services.core.browser_pool import browser_pool
+from app.services.core.host_scheduler import host_scheduler
+from app.services.core.http_clients import http_clients
 
 
 class HealthRouter(BaseRouter):
@@ -9,7 +16,16 @@ class HealthRouter(BaseRouter):
     def _setup_routes(self):
         @self.router.get("")
         async def health_check():
-            return {"status": "ok"}
+            return {
+                # Missing indexes leave the app running without their unique constraints
+                "status": "degraded" if failed_indexes else "ok",
+                "database": {"pool": db_manager.pool_stats(), "failed_indexes": failed_indexes},
+                "caches": {name: cache.stats() for name, cache in repository_caches.items()},
+                "password_hasher": password_hasher.stats(),
+                "browser_pool": browser_pool.stats(),
+                "http_clients": http_clients.stats(),
+                "hosts": host_scheduler.stats(),
+            }
 
 
 router = HealthRouter().get_router()
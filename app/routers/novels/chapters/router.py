@@ -1,28 +1,33 @@
 from fastapi import Depends, HTTPException, status, Query, Path
 from typing import List, Optional
-from app.models.novel import NovelType, PyObjectId, NovelUpdate
+from app.models.novel import NovelType, PyObjectId
 from app.models.chapter import (
+    Chapter,
     ChapterCreate,
     ChapterListResponse,
+    ChapterSummary,
+    ChapterFetchResponse,
     ChapterDownloadResponse,
     ReadingProgress,
     ReadingProgressCreate,
 )
-from app.db.database import get_database
+from app.db.database import get_database, get_list_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.services.utils.chapter_pipeline import ChapterPipeline, ChapterResult, Stage
 from app.services.utils.epub_service import epub_service
 from app.services.core.scraper_service import scrape_chapters_for_novel, ScraperError, scrape_chapter_content
 from fastapi.responses import StreamingResponse
 import io
-from datetime import datetime
 from app.services.utils.translation_service import translation_service
 from app.services.core.storage_service import storage_service
-from app.repositories.chapter_repository import ChapterRepository
+from app.repositories.chapter_repository import ChapterRepository, encode_chapter_cursor, decode_chapter_cursor
 from app.repositories.novel_repository import NovelRepository
 from app.repositories.reading_progress_repository import ReadingProgressRepository
+from app.repositories.progress_buffer import reading_progress_buffer
 from app.routers.auth.router import get_current_user
 from app.models.user import UserInDB
 from app.routers.base import BaseRouter
+from app.core.config import settings
 
 
 class ChaptersRouter(BaseRouter):
@@ -37,26 +42,85 @@ class ChaptersRouter(BaseRouter):
             page: int = Query(1, ge=1),
             page_size: int = Query(50, ge=1, le=100),
             sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-            chapter_repository: ChapterRepository = Depends(get_chapter_repository),
-            novel_repository: NovelRepository = Depends(get_novel_repository),
+            cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+            summary: bool = Query(False, description="Only return chapter numbers, titles and read/downloaded flags"),
+            chapter_repository: ChapterRepository = Depends(get_chapter_list_repository),
+            novel_repository: NovelRepository = Depends(get_novel_list_repository),
         ):
-            novel = await novel_repository.get_by_id(novel_id)
+            novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
             if novel is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found"
                 )
 
+            after = None
             skip = (page - 1) * page_size
-            chapters, total_chapters = await chapter_repository.get_by_novel_id(
-                novel_id, skip=skip, limit=page_size, sort_order=sort_order
+            if cursor:
+                try:
+                    after, sort_order = decode_chapter_cursor(cursor)
+                except ValueError as e:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+                skip = 0
+
+            chapters, _ = await chapter_repository.get_by_novel_id(
+                novel_id,
+                skip=skip,
+                limit=page_size,
+                sort_order=sort_order,
+                after=after,
+                model_class=ChapterSummary if summary else Chapter,
             )
 
+            # The total comes from the counters on the novel instead of a count query per page
+            total_chapters = novel.total_chapters
             total_pages = (total_chapters + page_size - 1) // page_size
+            next_cursor = (
+                encode_chapter_cursor(chapters[-1].chapter_number, sort_order) if len(chapters) == page_size else None
+            )
 
             return ChapterListResponse(
-                chapters=chapters, total=total_chapters, page=page, page_size=page_size, total_pages=total_pages
+                chapters=chapters,
+                total=total_chapters,
+                page=page,
+                page_size=page_size,
+                total_pages=total_pages,
+                next_cursor=next_cursor,
             )
 
+        @self.router.get("/progress", response_model=List[ReadingProgress])
+        async def get_novel_progress(
+            novel_id: PyObjectId = Path(...),
+            current_user: UserInDB = Depends(get_current_user),
+            reading_progress_repository: ReadingProgressRepository = Depends(get_reading_progress_repository),
+        ):
+            return await reading_progress_repository.get_user_progress(current_user.id, novel_id)
+
+        @self.router.get("/{chapter_number}/next", response_model=Chapter)
+        async def get_next_chapter(
+            novel_id: PyObjectId = Path(...),
+            chapter_number: int = Path(...),
+            chapter_repository: ChapterRepository = Depends(get_chapter_repository),
+        ):
+            chapter = await chapter_repository.get_next_chapter(novel_id, chapter_number)
+            if not chapter:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=f"No chapter after chapter {chapter_number}"
+                )
+            return chapter
+
+        @self.router.get("/{chapter_number}/previous", response_model=Chapter)
+        async def get_previous_chapter(
+            novel_id: PyObjectId = Path(...),
+            chapter_number: int = Path(...),
+            chapter_repository: ChapterRepository = Depends(get_chapter_repository),
+        ):
+            chapter = await chapter_repository.get_previous_chapter(novel_id, chapter_number)
+            if not chapter:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=f"No chapter before chapter {chapter_number}"
+                )
+            return chapter
+
         @self.router.get("/{chapter_number}")
         async def download_chapter(
             novel_id: PyObjectId = Path(...),
@@ -66,7 +130,7 @@ class ChaptersRouter(BaseRouter):
             chapter_repository: ChapterRepository = Depends(get_chapter_repository),
             novel_repository: NovelRepository = Depends(get_novel_repository),
         ):
-            novel = await novel_repository.get_by_id(novel_id)
+            novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
             if novel is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found"
@@ -88,7 +152,7 @@ class ChaptersRouter(BaseRouter):
                     return content
 
                 if format == "epub":
-                    epub_bytes, filename = await epub_service.create_epub(
+                    epub_bytes, filename, _ = await epub_service.create_epub(
                         novel_id=str(novel_id),
                         novel_title=novel.title,
                         author=novel.author or "Unknown",
@@ -146,39 +210,49 @@ class ChaptersRouter(BaseRouter):
             chapter_repository: ChapterRepository = Depends(get_chapter_repository),
             novel_repository: NovelRepository = Depends(get_novel_repository),
         ):
-            novel = await novel_repository.get_by_id(novel_id)
+            novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
             if novel is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found"
                 )
 
-            chapters = []
-            for chapter_number in chapter_numbers:
-                chapter = await chapter_repository.get_by_number(novel_id, chapter_number)
-                if chapter:
-                    chapters.append(chapter)
+            chapters = await chapter_repository.get_by_numbers(novel_id, chapter_numbers)
 
             if not chapters:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No valid chapters found")
 
             try:
                 if novel.type == NovelType.MANHWA:
-                    chapters_content = []
-                    for chapter in chapters:
-                        content = await scrape_chapter_content(
+
+                    async def fetch(result: ChapterResult) -> None:
+                        chapter = result.chapter
+                        result.content = await scrape_chapter_content(
                             str(chapter.url), novel.source_name, str(novel_id), chapter.chapter_number
                         )
+
+                    pipeline = ChapterPipeline([Stage("fetch", fetch, settings.CHAPTER_FETCH_WORKERS)])
+                    results = await pipeline.run(chapters)
+
+                    chapters_content = []
+                    failed = []
+                    for result in results:
+                        chapter = result.chapter
+                        if not result.ok:
+                            failed.append({"chapter_number": chapter.chapter_number, "error": result.error})
+                            continue
                         chapters_content.append(
-                            {"chapter_number": chapter.chapter_number, "title": chapter.title, "content": content}
+                            {
+                                "chapter_number": chapter.chapter_number,
+                                "title": chapter.title,
+                                "content": result.content,
+                            }
                         )
-
-                    for chapter in chapters:
                         await chapter_repository.mark_as_downloaded(chapter.id, str(chapter.url))
                         await chapter_repository.mark_as_read(chapter.id)
 
-                    return {"type": "manhwa", "chapters": chapters_content}
+                    return {"type": "manhwa", "chapters": chapters_content, "failed": failed}
 
-                epub_bytes, filename = await epub_service.create_epub(
+                epub_bytes, filename, failures = await epub_service.create_epub(
                     novel_id=str(novel_id),
                     novel_title=novel.title,
                     author=novel.author or "Unknown",
@@ -187,27 +261,30 @@ class ChaptersRouter(BaseRouter):
                     translate=(language == "es"),
                 )
 
+                failed_numbers = {result.chapter.chapter_number for result in failures}
                 for chapter in chapters:
+                    if chapter.chapter_number in failed_numbers:
+                        continue
                     await chapter_repository.mark_as_downloaded(chapter.id, str(chapter.url))
                     await chapter_repository.mark_as_read(chapter.id)
 
-                return StreamingResponse(
-                    io.BytesIO(epub_bytes),
-                    media_type="application/epub+zip",
-                    headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-                )
+                headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+                if failed_numbers:
+                    # The EPUB is built without them; let the client retry just those
+                    headers["X-Failed-Chapters"] = ",".join(str(number) for number in sorted(failed_numbers))
+                return StreamingResponse(io.BytesIO(epub_bytes), media_type="application/epub+zip", headers=headers)
             except Exception as e:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error generating content: {str(e)}"
                 )
 
-        @self.router.post("/fetch", response_model=ChapterListResponse)
+        @self.router.post("/fetch", response_model=ChapterFetchResponse)
         async def fetch_chapters_from_source(
             novel_id: PyObjectId = Path(...),
             chapter_repository: ChapterRepository = Depends(get_chapter_repository),
             novel_repository: NovelRepository = Depends(get_novel_repository),
         ):
-            novel = await novel_repository.get_by_id(novel_id)
+            novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
             if novel is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found"
@@ -221,36 +298,32 @@ class ChaptersRouter(BaseRouter):
                         status_code=status.HTTP_404_NOT_FOUND, detail="No chapters found on the source website"
                     )
 
-                # Get existing chapters and create a set of (novel_id, chapter_number) tuples for quick lookup
-                existing_chapters, total = await chapter_repository.get_by_novel_id(novel_id, limit=None)
-                existing_chapters_set = {(c.novel_id, c.chapter_number) for c in existing_chapters}
-
-                created_chapters = []
-                for chapter in new_chapters:
-                    # Check if chapter already exists using the set for O(1) lookup
-                    if (novel_id, chapter.chapter_number) in existing_chapters_set:
-                        continue
-
-                    chapter_dict = {
-                        "novel_id": novel_id,
-                        "title": chapter.title,
-                        "chapter_number": chapter.chapter_number,
-                        "chapter_title": chapter.chapter_title,
-                        "url": str(chapter.url),
-                        "content_type": "novel" if novel.type == NovelType.NOVEL else "manhwa",
-                        "language": novel.source_language or "en",
-                    }
-
-                    created_chapter = await chapter_repository.create(ChapterCreate(**chapter_dict))
-                    created_chapters.append(created_chapter)
+                # Only the chapter numbers are needed to skip chapters we already have
+                existing_numbers = set(await chapter_repository.get_chapter_numbers(novel_id))
+
+                chapters_to_create = [
+                    ChapterCreate(
+                        novel_id=novel_id,
+                        title=chapter.title,
+                        chapter_number=chapter.chapter_number,
+                        chapter_title=chapter.chapter_title,
+                        url=str(chapter.url),
+                        content_type="novel" if novel.type == NovelType.NOVEL else "manhwa",
+                        language=novel.source_language or "en",
+                    )
+                    for chapter in new_chapters
+                    if chapter.chapter_number not in existing_numbers
+                ]
 
-                await novel_repository.update(novel_id, NovelUpdate(last_updated_chapters=datetime.utcnow()))
+                result = await chapter_repository.bulk_upsert_chapters(novel_id, chapters_to_create)
 
-                return ChapterListResponse(
-                    total=len(created_chapters),
+                return ChapterFetchResponse(
+                    total=result["inserted"],
                     page=1,
-                    page_size=len(created_chapters),
+                    page_size=result["inserted"],
                     total_pages=1,
+                    inserted=result["inserted"],
+                    matched=len(new_chapters) - len(chapters_to_create) + result["matched"],
                 )
 
             except ScraperError as e:
@@ -277,7 +350,13 @@ class ChaptersRouter(BaseRouter):
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"Chapter {chapter_number} not found"
                 )
 
-            progress_data = ReadingProgressCreate(user_id=current_user.id, chapter_id=chapter.id, progress=progress)
+            progress_data = ReadingProgressCreate(
+                user_id=current_user.id,
+                chapter_id=chapter.id,
+                novel_id=novel_id,
+                chapter_number=chapter.chapter_number,
+                progress=progress,
+            )
 
             return await reading_progress_repository.create_or_update(progress_data)
 
@@ -297,14 +376,6 @@ class ChaptersRouter(BaseRouter):
 
             return await reading_progress_repository.get_progress(current_user.id, chapter.id)
 
-        @self.router.get("/progress", response_model=List[ReadingProgress])
-        async def get_novel_progress(
-            novel_id: PyObjectId = Path(...),
-            current_user: UserInDB = Depends(get_current_user),
-            reading_progress_repository: ReadingProgressRepository = Depends(get_reading_progress_repository),
-        ):
-            return await reading_progress_repository.get_user_progress(current_user.id, novel_id)
-
 
 def get_chapter_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ChapterRepository:
     return ChapterRepository(db)
@@ -314,8 +385,16 @@ def get_novel_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> No
     return NovelRepository(db)
 
 
+def get_chapter_list_repository(db: AsyncIOMotorDatabase = Depends(get_list_database)) -> ChapterRepository:
+    return ChapterRepository(db)
+
+
+def get_novel_list_repository(db: AsyncIOMotorDatabase = Depends(get_list_database)) -> NovelRepository:
+    return NovelRepository(db)
+
+
 def get_reading_progress_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> ReadingProgressRepository:
-    return ReadingProgressRepository(db)
+    return ReadingProgressRepository(db, buffer=reading_progress_buffer)
 
 
 router = ChaptersRouter().get_router()
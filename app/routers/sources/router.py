@@ -1,7 +1,7 @@
 from fastapi import Depends, HTTPException, status, Query
 from typing import List, Optional
 from app.models.source import SourceCreate, SourcePublic, SourceUpdate, PyObjectId
-from app.db.database import get_database
+from app.db.database import get_database, get_list_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.repositories.source_repository import SourceRepository
 from app.routers.base import BaseRouter
@@ -25,7 +25,7 @@ class SourcesRouter(BaseRouter):
 
         @self.router.get("/", response_model=List[SourcePublic])
         async def get_sources(
-            source_repository: SourceRepository = Depends(get_source_repository),
+            source_repository: SourceRepository = Depends(get_source_list_repository),
             skip: int = Query(0, ge=0, description="Number of items to skip"),
             limit: int = Query(100, ge=1, le=100, description="Number of items to return"),
             search: Optional[str] = Query(None, description="Search in name and description"),
@@ -36,7 +36,7 @@ class SourcesRouter(BaseRouter):
                     {"name": {"$regex": search, "$options": "i"}},
                     {"description": {"$regex": search, "$options": "i"}},
                 ]
-            return await source_repository.filter(query, skip=skip, limit=limit)
+            return await source_repository.filter(query, skip=skip, limit=limit, model_class=SourcePublic)
 
         @self.router.get("/{source_id}", response_model=SourcePublic)
         async def get_source_by_id(
@@ -78,4 +78,8 @@ def get_source_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> S
     return SourceRepository(db)
 
 
+def get_source_list_repository(db: AsyncIOMotorDatabase = Depends(get_list_database)) -> SourceRepository:
+    return SourceRepository(db)
+
+
 router = SourcesRouter().get_router()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from pymongo.errors import DuplicateKeyError
 from app.models.user import UserCreate, UserUpdate, UserPublic, UserInDB
 from app.repositories.user_repository import UserRepository
 from app.dependencies.auth import get_current_user, get_user_repository
@@ -12,7 +13,11 @@ async def register(user: UserCreate, user_repository: UserRepository = Depends(g
     db_user = await user_repository.get_by_email(user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return await user_repository.create(user)
+    try:
+        return await user_repository.create(user)
+    except DuplicateKeyError:
+        # Registered concurrently, or the username is taken
+        raise HTTPException(status_code=400, detail="Email or username already registered")
 
 
 @router.get("/me", response_model=UserPublic)
@@ -0,0 +1,66 @@
+import asyncio
+import copy
+import time
+from bson import ObjectId
+from app.db.database import Database
+from app.models.chapter import Chapter
+from app.repositories.chapter_repository import ChapterRepository
+from app.scripts.benchmark_novel_stats import seed_chapters, ROUNDS
+
+BENCHMARK_DB_NAME = "benchmark_chapter_reads"
+CHAPTER_COUNT = 10_000
+
+
+def legacy_models(documents: list) -> list:
+    """The previous implementation: one model constructor call per document."""
+    return [Chapter(**chapter) for chapter in documents]
+
+
+def time_conversion(func, documents: list, *args) -> float:
+    """Return the best rows/sec over ROUNDS runs, converting a fresh copy of the documents each time."""
+    best = 0.0
+    for _ in range(ROUNDS):
+        batch = copy.deepcopy(documents)
+        start = time.perf_counter()
+        func(batch, *args)
+        best = max(best, len(batch) / (time.perf_counter() - start))
+    return best
+
+
+async def time_reads(chapter_repository: ChapterRepository, novel_id: ObjectId) -> float:
+    """Return the best rows/sec over ROUNDS full reads through the repository."""
+    best = 0.0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        chapters, _ = await chapter_repository.get_by_novel_id(novel_id, limit=None)
+        best = max(best, len(chapters) / (time.perf_counter() - start))
+    return best
+
+
+async def run_benchmark():
+    """Compare per-row model construction against the bulk validation used by the repositories."""
+    await Database.connect(mongodb_db=BENCHMARK_DB_NAME)
+    db = Database.get_db()
+    await db.chapters.drop()
+
+    chapter_repository = ChapterRepository(db)
+    try:
+        novel_id = ObjectId()
+        await seed_chapters(db, novel_id, CHAPTER_COUNT)
+        documents = await chapter_repository.get_documents_by_novel_id(novel_id, limit=None)
+
+        legacy = time_conversion(legacy_models, documents)
+        bulk = time_conversion(chapter_repository._to_chapters, documents, novel_id)
+        reads = await time_reads(chapter_repository, novel_id)
+
+        print(f"{CHAPTER_COUNT} chapters")
+        print(f"{'per-row Chapter(**doc)':>28}: {legacy:>10,.0f} rows/sec")
+        print(f"{'bulk TypeAdapter':>28}: {bulk:>10,.0f} rows/sec ({bulk / legacy:.1f}x)")
+        print(f"{'get_by_novel_id incl. query':>28}: {reads:>10,.0f} rows/sec")
+    finally:
+        await Database.client.drop_database(BENCHMARK_DB_NAME)
+        await Database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
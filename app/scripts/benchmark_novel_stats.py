@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import datetime
+from bson import ObjectId
+from app.db.database import Database
+from app.repositories.chapter_repository import ChapterRepository
+from app.repositories.novel_repository import NovelRepository
+
+BENCHMARK_DB_NAME = "benchmark_novel_stats"
+CHAPTER_COUNTS = [1_000, 10_000, 50_000]
+ROUNDS = 5
+
+
+async def seed_chapters(db, novel_id: ObjectId, count: int) -> None:
+    """Insert `count` synthetic chapters for a novel."""
+    now = datetime.utcnow()
+    batch = []
+    for number in range(1, count + 1):
+        batch.append(
+            {
+                "novel_id": str(novel_id),
+                "title": f"Chapter {number}",
+                "chapter_number": number,
+                "chapter_title": f"Chapter {number}",
+                "url": f"https://example.com/novel/chapter-{number}",
+                "read": number % 3 == 0,
+                "downloaded": number % 2 == 0,
+                "content_type": "novel",
+                "language": "en",
+                "added_at": now,
+                "last_updated": now,
+                "reading_progress": 0.0,
+            }
+        )
+        if len(batch) == 5_000:
+            await db.chapters.insert_many(batch)
+            batch = []
+    if batch:
+        await db.chapters.insert_many(batch)
+
+
+async def legacy_stats(chapter_repository: ChapterRepository, novel_id: ObjectId) -> dict:
+    """The previous implementation: load every chapter and count in Python."""
+    chapters, _ = await chapter_repository.get_by_novel_id(novel_id, limit=None)
+    return {
+        "total_chapters": len(chapters),
+        "last_chapter_number": max(chapter.chapter_number for chapter in chapters) if chapters else 0,
+        "read_chapters": sum(1 for chapter in chapters if chapter.read),
+        "downloaded_chapters": sum(1 for chapter in chapters if chapter.downloaded),
+    }
+
+
+async def time_rounds(func, *args) -> float:
+    """Return the best wall time in milliseconds over ROUNDS runs."""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+async def run_benchmark():
+    """Compare the legacy stats path against the aggregation pipeline."""
+    await Database.connect(mongodb_db=BENCHMARK_DB_NAME)
+    db = Database.get_db()
+    await db.chapters.drop()
+
+    chapter_repository = ChapterRepository(db)
+    novel_repository = NovelRepository(db)
+
+    print(f"{'chapters':>10} | {'legacy (ms)':>12} | {'aggregate (ms)':>14} | {'speedup':>8}")
+    print("-" * 54)
+    try:
+        for count in CHAPTER_COUNTS:
+            novel_id = ObjectId()
+            await seed_chapters(db, novel_id, count)
+
+            legacy_ms = await time_rounds(legacy_stats, chapter_repository, novel_id)
+            aggregate_ms = await time_rounds(novel_repository._calculate_novel_stats, novel_id)
+
+            print(f"{count:>10} | {legacy_ms:>12.1f} | {aggregate_ms:>14.1f} | {legacy_ms / aggregate_ms:>7.1f}x")
+    finally:
+        await Database.client.drop_database(BENCHMARK_DB_NAME)
+        await Database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
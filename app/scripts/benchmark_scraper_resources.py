@@ -0,0 +1,69 @@
+import asyncio
+import sys
+import time
+from typing import Optional
+from app.models.source import ResourcePolicy
+from app.services.core.browser_pool import BrowserPool
+
+# Pages from the Playwright sources; pass other URLs as arguments
+DEFAULT_URLS = ["https://novelbin.com/b/shadow-slave", "https://www.skynovels.net/novelas"]
+ROUNDS = 3
+
+
+async def load_page(pool: BrowserPool, url: str, policy: Optional[ResourcePolicy]) -> dict:
+    """Load url in a fresh context, as a scrape would, and measure it."""
+    lease = await pool.acquire()
+    page = lease.page
+    counters = {"requests": 0, "blocked": 0, "bytes": 0}
+
+    async def route(route):
+        counters["requests"] += 1
+        request = route.request
+        if policy is not None and policy.blocks(request.resource_type, request.url):
+            counters["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def count_bytes(response):
+        try:
+            counters["bytes"] += len(await response.body())
+        except Exception:
+            pass  # Redirects and aborted requests have no body
+
+    page.on("response", count_bytes)
+    await page.route("**/*", route)
+    try:
+        start = time.perf_counter()
+        await page.goto(url, wait_until="load", timeout=60000)
+        counters["load_ms"] = (time.perf_counter() - start) * 1000
+    finally:
+        page.remove_listener("response", count_bytes)
+        # Not reusable: the next round must not start with a warm cache
+        await pool.release(lease, reusable=False)
+    return counters
+
+
+async def run_benchmark(urls):
+    """Compare page-load time with and without the default resource policy."""
+    pool = BrowserPool(max_pages=1)
+    policies = {"everything": None, "policy": ResourcePolicy()}
+
+    print(f"{'url':<45} | {'loading':>10} | {'load (ms)':>9} | {'requests':>8} | {'blocked':>7} | {'KiB':>8}")
+    print("-" * 103)
+    try:
+        for url in urls:
+            for label, policy in policies.items():
+                runs = [await load_page(pool, url, policy) for _ in range(ROUNDS)]
+                best = min(runs, key=lambda run: run["load_ms"])
+                print(
+                    f"{url[:45]:<45} | {label:>10} | {best['load_ms']:>9.0f} | {best['requests']:>8} | "
+                    f"{best['blocked']:>7} | {best['bytes'] / 1024:>8.0f}"
+                )
+        print(f"Best of {ROUNDS} loads, each in a new browser context")
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(sys.argv[1:] or DEFAULT_URLS))
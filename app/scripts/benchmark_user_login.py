@@ -0,0 +1,77 @@
+import asyncio
+import time
+from datetime import datetime
+from app.core.security import pwd_context
+from app.db.database import Database
+from app.db.indexes import ensure_indexes
+from app.repositories.user_repository import UserRepository, normalize_email
+from app.scripts.benchmark_novel_stats import time_rounds
+
+BENCHMARK_DB_NAME = "benchmark_user_login"
+USER_COUNTS = [1_000, 10_000, 100_000]
+PASSWORD = "benchmark-password"
+
+
+async def seed_users(db, start: int, end: int, hashed_password: str) -> None:
+    """Insert users numbered [start, end). They share one password hash, which is the slow part to build."""
+    now = datetime.utcnow()
+    batch = []
+    for number in range(start, end):
+        email = f"Reader.{number}@Example.com"
+        batch.append(
+            {
+                "username": f"reader{number}",
+                "email": email,
+                "email_normalized": normalize_email(email),
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "created_at": now,
+            }
+        )
+        if len(batch) == 5_000:
+            await db.users.insert_many(batch)
+            batch = []
+    if batch:
+        await db.users.insert_many(batch)
+
+
+async def legacy_get_by_email(db, email: str):
+    """The previous lookup: an unanchored case-insensitive regex over every user."""
+    return await db.users.find_one({"email": {"$regex": email, "$options": "i"}})
+
+
+async def run_benchmark():
+    """Compare login-by-email latency as the users collection grows."""
+    await Database.connect(mongodb_db=BENCHMARK_DB_NAME)
+    db = Database.get_db()
+    await db.users.drop()
+    await ensure_indexes(db)
+
+    user_repository = UserRepository(db)
+    hashed_password = pwd_context.hash(PASSWORD)
+
+    print(f"{'users':>10} | {'regex (ms)':>10} | {'indexed (ms)':>12} | {'authenticate (ms)':>17}")
+    print("-" * 60)
+    try:
+        seeded = 0
+        for count in USER_COUNTS:
+            await seed_users(db, seeded, count, hashed_password)
+            seeded = count
+            # The last user inserted is the worst case for a collection scan
+            email = f"reader.{count - 1}@example.com"
+
+            legacy_ms = await time_rounds(legacy_get_by_email, db, email)
+            indexed_ms = await time_rounds(user_repository.get_by_email, email)
+            start = time.perf_counter()
+            assert await user_repository.authenticate(email, PASSWORD) is not None
+            authenticate_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{count:>10} | {legacy_ms:>10.2f} | {indexed_ms:>12.2f} | {authenticate_ms:>17.1f}")
+        print("authenticate includes one bcrypt verification on the password hashing pool")
+    finally:
+        await Database.client.drop_database(BENCHMARK_DB_NAME)
+        await Database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
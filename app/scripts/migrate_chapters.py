@@ -1,70 +1,133 @@
 import asyncio
-from app.db.database import get_database, connect_to_mongo
-from app.models.chapter import ChapterCreate
-from app.repositories.chapter_repository import ChapterRepository
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+from pymongo.errors import BulkWriteError
+from app.db.database import get_database, connect_to_mongo, close_mongo_connection
+from app.repositories.chapter_repository import DUPLICATE_KEY_ERROR
 from app.repositories.novel_repository import NovelRepository
 
+CHECKPOINTS_COLLECTION = "chapter_migration_checkpoints"
+INSERT_BATCH_SIZE = 1000
+
+
+def build_chapter_documents(novel: Dict[str, Any], existing_numbers: set) -> List[Dict[str, Any]]:
+    """Build the chapter documents for the chapters embedded in a novel, with their final flags set."""
+    now = datetime.utcnow()
+    content_type = "manhwa" if novel.get("type") == "manhwa" else "novel"
+    language = novel.get("source_language") or "en"
+
+    documents = []
+    seen = set(existing_numbers)
+    for chapter in novel["chapters"]:
+        # Skip chapters stored by an earlier, interrupted run and duplicates within the novel
+        if chapter["chapter_number"] in seen:
+            continue
+        seen.add(chapter["chapter_number"])
+
+        documents.append(
+            {
+                "novel_id": str(novel["_id"]),
+                "title": chapter["title"],
+                "chapter_number": chapter["chapter_number"],
+                "chapter_title": chapter.get("chapter_title"),
+                # Convert URL to string if it's an HttpUrl object
+                "url": str(chapter["url"]),
+                "content_type": content_type,
+                "language": language,
+                "read": bool(chapter.get("read", False)),
+                "downloaded": bool(chapter.get("downloaded", False)),
+                "added_at": now,
+                "last_updated": now,
+            }
+        )
+    return documents
+
+
+async def insert_chapters(db, documents: List[Dict[str, Any]]) -> int:
+    """Insert chapter documents in unordered batches. Returns the number of chapters inserted."""
+    inserted = 0
+    for start in range(0, len(documents), INSERT_BATCH_SIZE):
+        batch = documents[start : start + INSERT_BATCH_SIZE]
+        try:
+            result = await db.chapters.insert_many(batch, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Chapters that already exist are rejected by the unique index; everything else is inserted
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            inserted += e.details.get("nInserted", 0)
+    return inserted
+
 
 async def migrate_chapters():
-    """Migrate chapters from novels collection to the new chapters collection."""
+    """Migrate chapters from novels collection to the new chapters collection.
+
+    Progress is checkpointed per novel, so the migration can be rerun after a crash and only picks up
+    the novels that weren't completed.
+    """
     # Initialize MongoDB connection
     await connect_to_mongo()
     db = get_database()
-
-    chapter_repository = ChapterRepository(db)
-    novel_repository = NovelRepository(db)
-
-    # Get all novels
-    novels = await novel_repository.get_all(limit=1000)
+    checkpoints = db[CHECKPOINTS_COLLECTION]
 
     total_chapters_migrated = 0
     total_novels_processed = 0
+    migrated_novel_ids = []
+    started = time.perf_counter()
+
+    try:
+        cursor = db.novels.find(
+            {"chapters": {"$exists": True}}, {"title": 1, "type": 1, "source_language": 1, "chapters": 1}
+        ).batch_size(10)
+        async for novel in cursor:
+            checkpoint = await checkpoints.find_one({"_id": novel["_id"]})
+            if checkpoint and checkpoint["status"] == "completed":
+                continue
+
+            novel_started = time.perf_counter()
+            await checkpoints.update_one(
+                {"_id": novel["_id"]},
+                {"$set": {"status": "in_progress"}, "$setOnInsert": {"started_at": datetime.utcnow()}},
+                upsert=True,
+            )
 
-    for novel in novels:
-        # Get the full novel document to access chapters
-        novel_doc = await db.novels.find_one({"_id": novel.id})
-        if not novel_doc or "chapters" not in novel_doc:
-            continue
+            existing_numbers = set()
+            if checkpoint:
+                # Resuming an interrupted novel: keep the chapters that were already stored
+                existing_numbers = set(await db.chapters.distinct("chapter_number", {"novel_id": str(novel["_id"])}))
 
-        chapters = novel_doc["chapters"]
-        if not chapters:
-            continue
+            documents = build_chapter_documents(novel, existing_numbers) if novel["chapters"] else []
+            inserted = await insert_chapters(db, documents)
 
-        # Create chapters in the new collection
-        for chapter in chapters:
-            # Convert URL to string if it's an HttpUrl object
-            url = str(chapter["url"]) if hasattr(chapter["url"], "str") else chapter["url"]
-
-            chapter_create = ChapterCreate(
-                novel_id=novel.id,
-                title=chapter["title"],
-                chapter_number=chapter["chapter_number"],
-                chapter_title=chapter.get("chapter_title"),
-                url=url,
-                content_type="novel" if novel.type == "novel" else "manhwa",
-                language=novel.source_language or "en",
+            # Remove chapters from the novel document
+            await db.novels.update_one({"_id": novel["_id"]}, {"$unset": {"chapters": ""}})
+            await checkpoints.update_one(
+                {"_id": novel["_id"]},
+                {"$set": {"status": "completed", "chapters": inserted, "completed_at": datetime.utcnow()}},
             )
 
-            # Create the chapter
-            created_chapter = await chapter_repository.create(chapter_create)
+            total_chapters_migrated += inserted
+            total_novels_processed += 1
+            migrated_novel_ids.append(novel["_id"])
 
-            # Update chapter status if needed
-            if chapter.get("read", False):
-                await chapter_repository.mark_as_read(created_chapter.id)
-            if chapter.get("downloaded", False):
-                await chapter_repository.mark_as_downloaded(created_chapter.id, chapter.get("local_path", ""))
-
-            total_chapters_migrated += 1
-
-        # Remove chapters from the novel document
-        await db.novels.update_one({"_id": novel.id}, {"$unset": {"chapters": ""}})
+            elapsed = time.perf_counter() - novel_started
+            print(
+                f"Processed novel {novel.get('title')} - Migrated {inserted} chapters "
+                f"({inserted / elapsed if elapsed else 0:.0f} chapters/sec)"
+            )
 
-        total_novels_processed += 1
-        print(f"Processed novel {novel.title} - Migrated {len(chapters)} chapters")
+        if migrated_novel_ids:
+            await NovelRepository(db).reconcile_counters(migrated_novel_ids)
+    finally:
+        await close_mongo_connection()
 
+    elapsed = time.perf_counter() - started
     print("\nMigration completed:")
     print(f"Total novels processed: {total_novels_processed}")
     print(f"Total chapters migrated: {total_chapters_migrated}")
+    print(f"Throughput: {total_chapters_migrated / elapsed if elapsed else 0:.0f} chapters/sec in {elapsed:.1f}s")
 
 
 if __name__ == "__main__":
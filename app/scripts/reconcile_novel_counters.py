@@ -0,0 +1,24 @@
+import asyncio
+from app.db.database import get_database, connect_to_mongo, close_mongo_connection
+from app.repositories.novel_repository import NovelRepository
+
+
+async def reconcile_novel_counters():
+    """Rebuild the chapter counters stored on every novel document from the chapters collection."""
+    await connect_to_mongo()
+    try:
+        novel_repository = NovelRepository(get_database())
+        stats_by_novel = await novel_repository.reconcile_counters()
+
+        for novel_id, stats in stats_by_novel.items():
+            print(
+                f"Novel {novel_id}: {stats['total_chapters']} chapters, {stats['read_chapters']} read, "
+                f"{stats['downloaded_chapters']} downloaded, last chapter {stats['last_chapter_number']}"
+            )
+        print(f"\nReconciled counters for {len(stats_by_novel)} novels")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_novel_counters())
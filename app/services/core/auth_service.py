@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,12 +6,14 @@ from bson import ObjectId
 
 from app.core.config import settings
 from app.models.user import UserInDB, UserUpdate, Token
+from app.repositories.cache import PrincipalCache, principal_cache
 from app.repositories.user_repository import UserRepository
 
 
 class AuthService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, principals: PrincipalCache = principal_cache):
         self.user_repository = user_repository
+        self.principals = principals
 
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -79,6 +82,11 @@ class AuthService:
             raise ValueError("Invalid refresh token")
 
     async def get_current_user(self, token: str) -> UserInDB:
+        # Tokens seen recently resolve without decoding or a users lookup
+        user = self.principals.get(token)
+        if user is not None:
+            return user
+
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
             user_id: str = payload.get("sub")
@@ -86,10 +94,13 @@ class AuthService:
                 raise ValueError("Could not validate credentials")
 
             user_id_obj = ObjectId(user_id)
+            generation = self.principals.generation(user_id_obj)
             user = await self.user_repository.get_by_id(user_id_obj)
             if user is None:
                 raise ValueError("Could not validate credentials")
 
+            expires_in = payload["exp"] - time.time() if "exp" in payload else None
+            self.principals.put(token, user, generation, token_expires_in=expires_in)
             return user
         except JWTError:
             raise ValueError("Could not validate credentials")
@@ -2,12 +2,16 @@ from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 import httpx
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Page, Route
 import re
 from urllib.parse import urljoin
 from app.models.novel import Chapter
+from app.models.source import RateLimit, ResourcePolicy
 import random
 from app.core.config import settings
+from app.services.core.browser_pool import BrowserPool, PageLease, browser_pool
+from app.services.core.host_scheduler import HostScheduler, host_scheduler
+from app.services.core.http_clients import HttpClientRegistry, http_clients
 
 
 class ScraperConfig(BaseModel):
@@ -24,6 +28,8 @@ class ScraperConfig(BaseModel):
     timeout: float = 10.0
     max_retries: int = 3
     use_playwright: bool = False  # Whether to use Playwright for JavaScript-heavy sites
+    rate_limit: Optional[RateLimit] = None  # Politeness towards base_url's host; None uses the SCRAPER_* defaults
+    resource_policy: Optional[ResourcePolicy] = None  # Playwright requests to abort; None loads everything
     special_actions: Dict[str, Dict[str, Any]] = Field(
         default_factory=lambda: {
             "view_all": {"enabled": False, "selector": None, "wait_after_click": 0, "scroll_after_click": False}
@@ -40,63 +46,96 @@ class ScraperError(Exception):
 class BaseScraper:
     """Base class for all scrapers with common functionality."""
 
-    def __init__(self, config: Optional[ScraperConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        pool: BrowserPool = browser_pool,
+        clients: HttpClientRegistry = http_clients,
+        scheduler: HostScheduler = host_scheduler,
+    ):
         if config is None:
             # Default configuration for backward compatibility
             config = ScraperConfig(name="base", base_url="", content_type="novel", selectors={}, patterns={})
         self.config = config
+        self.pool = pool
+        self.clients = clients
+        self.scheduler = scheduler
+        if config.rate_limit is not None:
+            # The limit covers the source's own host; other hosts, such as ScraperAPI, keep theirs
+            scheduler.set_rate_limit(config.base_url, config.rate_limit)
         self._client: Optional[httpx.AsyncClient] = None
-        self._browser: Optional[Browser] = None
+        self._lease: Optional[PageLease] = None
         self._page: Optional[Page] = None
         self._context = None
+        self.blocked_requests = 0
 
     async def __aenter__(self):
         """Context manager entry."""
-        self._client = httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=self.config.timeout,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-        )
+        # Shared with every other scrape, so it is not closed on exit
+        self._client = self.clients.http
 
         if self.config.use_playwright:
-            self._playwright = await async_playwright().start()
-            # Selecciona un User-Agent aleatorio
-            user_agent = random.choice(USER_AGENTS)
-            self._browser = await self._playwright.chromium.launch(headless=True)
-            self._context = await self._browser.new_context(user_agent=user_agent)
-            self._page = await self._context.new_page()
-            print(f"[Playwright] Usando User-Agent: {user_agent}")
+            # The browser is shared; the User-Agent only applies if the pool has to create a new context
+            self._lease = await self.pool.acquire(user_agent=random.choice(USER_AGENTS))
+            self._context = self._lease.context
+            self._page = self._lease.page
+            if self.config.resource_policy is not None:
+                await self._page.route("**/*", self._apply_resource_policy)
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-
-        if self._page:
-            await self._page.close()
+        self._client = None
+
+        if self._lease:
+            if self.config.resource_policy is not None:
+                # The page goes back to the pool, where another source may lease it
+                try:
+                    await self._page.unroute("**/*", self._apply_resource_policy)
+                except Exception as e:
+                    print(f"Error removing resource policy: {e}")
+            # A page left mid-way by a failed scrape is not handed to the next one
+            await self.pool.release(self._lease, reusable=exc_type is None)
+            self._lease = None
+            self._context = None
             self._page = None
 
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
-
-        if hasattr(self, "_playwright"):
-            await self._playwright.stop()
+    async def _apply_resource_policy(self, route: Route) -> None:
+        request = route.request
+        if self.config.resource_policy.blocks(request.resource_type, request.url):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def goto(self, url: str, **kwargs: Any):
+        """Navigate the Playwright page to url, waiting for the host's turn in the scheduler."""
+        async with self.scheduler.slot(url):
+            response = await self._page.goto(url, **kwargs)
+        if response is not None:
+            self.scheduler.record_status(url, response.status, response.headers.get("retry-after"))
+        return response
+
+    async def http_get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET url with the shared HTTP client, waiting for the host's turn in the scheduler."""
+        kwargs.setdefault("timeout", self.config.timeout)
+        async with self.scheduler.slot(url):
+            response = await self._client.get(url, **kwargs)
+        self.scheduler.record_status(url, response.status_code, response.headers.get("retry-after"))
+        return response
 
     async def fetch_html(self, url: str) -> str:
         """Fetch HTML content from a URL with retries and fallback to ScraperAPI if blocked."""
         try:
             if self.config.use_playwright and self._page:
-                await self._page.goto(url)
+                await self.goto(url)
                 await self._page.wait_for_timeout(10000)
                 html = await self._page.content()
             else:
                 if not self._client:
                     raise RuntimeError("Scraper must be used as an async context manager")
-                response = await self._client.get(url, headers=self.config.headers)
+                response = await self.http_get(url, headers=self.config.headers)
                 response.raise_for_status()
                 html = response.text
 
@@ -112,7 +151,7 @@ class BaseScraper:
             if not settings.SCRAPERAPI_KEY:
                 raise RuntimeError("SCRAPERAPI_KEY no configurada")
             scraperapi_url = f"http://api.scraperapi.com/?api_key={settings.SCRAPERAPI_KEY}&url={url}"
-            response = await self._client.get(scraperapi_url)
+            response = await self.http_get(scraperapi_url)
             response.raise_for_status()
             return response.text
 
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from app.core.config import settings
+
+
+@dataclass(eq=False)
+class PooledBrowser:
+    browser: Browser
+    started_at: float = field(default_factory=time.monotonic)
+    leases: int = 0  # Pages handed out, including reused ones
+    active: int = 0
+    retired: bool = False
+
+
+@dataclass(eq=False)
+class PageLease:
+    """A browser context and its page, lent to one scrape at a time."""
+
+    context: BrowserContext
+    page: Page
+    browser: PooledBrowser
+
+
+class BrowserPool:
+    """Process-wide pool of long-lived Chromium browsers shared by the Playwright scrapers.
+
+    Playwright and the browsers are started on the first lease and stopped in the app lifespan. Each
+    scrape leases a context with a page; when it returns cleanly the context is kept for the next scrape,
+    with its cookies, and otherwise it is closed. At most max_pages pages are leased at once; further
+    scrapes wait. A browser is retired after recycle_after_pages leases or recycle_after_seconds, to cap
+    memory leaks, and closed once its last page is returned.
+    """
+
+    def __init__(
+        self,
+        max_pages: int,
+        browsers: int = 1,
+        recycle_after_pages: int = 200,
+        recycle_after_seconds: float = 1800.0,
+        launcher: Optional[Callable[[], Awaitable[Browser]]] = None,
+    ):
+        self.max_pages = max_pages
+        self.browser_count = browsers
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_after_seconds = recycle_after_seconds
+        self._launcher = launcher or self._launch_chromium
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._idle: List[PageLease] = []
+        # Created on first use, so that they belong to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self.leases = 0
+        self.launched = 0
+        self.recycled = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def _launch_chromium(self) -> Browser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+    async def acquire(self, user_agent: Optional[str] = None) -> PageLease:
+        """Lease a page, waiting while max_pages pages are out. user_agent applies if a new context is created."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+
+        requested_at = time.perf_counter()
+        await self._semaphore.acquire()
+        wait_time = time.perf_counter() - requested_at
+
+        try:
+            lease = await self._lease(user_agent)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        lease.browser.leases += 1
+        self.leases += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        return lease
+
+    async def _lease(self, user_agent: Optional[str]) -> PageLease:
+        await self._retire_expired()
+        while self._idle:
+            lease = self._idle.pop()
+            if not lease.browser.retired:
+                lease.browser.active += 1
+                return lease
+
+        # The page counts against the browser from here, so a release can't close it while the context opens
+        browser = await self._pick_browser()
+        try:
+            context = await browser.browser.new_context(user_agent=user_agent)
+            try:
+                page = await context.new_page()
+            except BaseException:
+                await context.close()
+                raise
+        except BaseException:
+            browser.active -= 1
+            if browser.retired and browser.active == 0:
+                await self._close_browser(browser)
+            raise
+        return PageLease(context=context, page=page, browser=browser)
+
+    async def _pick_browser(self) -> PooledBrowser:
+        """Choose the browser for a new page and count the page against it."""
+        async with self._launch_lock:
+            live = [browser for browser in self._browsers if not browser.retired]
+            if len(live) < self.browser_count:
+                browser = PooledBrowser(await self._launcher())
+                self._browsers.append(browser)
+                self.launched += 1
+            else:
+                browser = min(live, key=lambda browser: browser.active)
+            browser.active += 1
+            return browser
+
+    async def _retire_expired(self) -> None:
+        now = time.monotonic()
+        for browser in list(self._browsers):
+            if browser.retired:
+                continue
+            if browser.leases >= self.recycle_after_pages or now - browser.started_at >= self.recycle_after_seconds:
+                browser.retired = True
+                self.recycled += 1
+                if browser.active == 0:
+                    await self._close_browser(browser)
+
+    async def release(self, lease: PageLease, reusable: bool = True) -> None:
+        """Return a leased page. Pass reusable=False if the scrape failed and the page may be in a bad state."""
+        browser = lease.browser
+        browser.active -= 1
+        try:
+            if reusable and not browser.retired:
+                try:
+                    # Drop the scraped page, but keep the context and its cookies for the next scrape
+                    await lease.page.goto("about:blank")
+                    self._idle.append(lease)
+                except Exception:
+                    await self._close_context(lease)
+            elif not browser.retired:
+                await self._close_context(lease)
+
+            if browser.retired and browser.active == 0:
+                await self._close_browser(browser)
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    async def _close_context(lease: PageLease) -> None:
+        try:
+            await lease.context.close()
+        except Exception as e:
+            print(f"Error closing browser context: {e}")
+
+    async def _close_browser(self, browser: PooledBrowser) -> None:
+        """Close a browser together with its idle contexts."""
+        self._idle = [lease for lease in self._idle if lease.browser is not browser]
+        if browser in self._browsers:
+            self._browsers.remove(browser)
+        try:
+            await browser.browser.close()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    async def close(self) -> None:
+        """Close every browser and stop Playwright."""
+        for browser in list(self._browsers):
+            await self._close_browser(browser)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Browsers, page usage and time spent waiting for a page."""
+        return {
+            "browsers": sum(1 for browser in self._browsers if not browser.retired),
+            "retiring_browsers": sum(1 for browser in self._browsers if browser.retired),
+            "max_pages": self.max_pages,
+            "active_pages": sum(browser.active for browser in self._browsers),
+            "idle_pages": len(self._idle),
+            "leases": self.leases,
+            "browsers_launched": self.launched,
+            "browsers_recycled": self.recycled,
+            "wait_time_avg_ms": self.wait_time_total / self.leases * 1000 if self.leases else 0.0,
+            "wait_time_max_ms": self.wait_time_max * 1000,
+        }
+
+
+browser_pool = BrowserPool(
+    max_pages=settings.BROWSER_POOL_MAX_PAGES,
+    browsers=settings.BROWSER_POOL_BROWSERS,
+    recycle_after_pages=settings.BROWSER_POOL_RECYCLE_AFTER_PAGES,
+    recycle_after_seconds=settings.BROWSER_POOL_RECYCLE_AFTER_SECONDS,
+)
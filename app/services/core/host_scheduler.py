@@ -0,0 +1,202 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.models.source import RateLimit
+
+# Responses that mean the host wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+SCRAPERAPI_HOST = "api.scraperapi.com"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostState:
+    """Token bucket, in-flight limit and backoff of one host."""
+
+    def __init__(self, rate_limit: RateLimit):
+        self.rate_limit = rate_limit
+        self.tokens = float(rate_limit.burst)
+        self.refilled_at = time.monotonic()
+        self.semaphore = asyncio.Semaphore(rate_limit.max_in_flight)
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def set_rate_limit(self, rate_limit: RateLimit) -> None:
+        """Apply a changed rate limit. Requests already holding or waiting for a slot keep the old in-flight limit."""
+        if rate_limit == self.rate_limit:
+            return
+        if rate_limit.max_in_flight != self.rate_limit.max_in_flight:
+            self.semaphore = asyncio.Semaphore(rate_limit.max_in_flight)
+        self.rate_limit = rate_limit
+        self.tokens = min(self.tokens, float(rate_limit.burst))
+
+    def _take_token(self, now: float) -> float:
+        """Take a token and return 0, or return how long until one is available."""
+        rate = self.rate_limit.requests_per_second
+        self.tokens = min(float(self.rate_limit.burst), self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+    async def acquire(self) -> asyncio.Semaphore:
+        """Wait for a slot and a token; returns the semaphore to release when the request is done."""
+        requested_at = time.monotonic()
+        self.waiting += 1
+        semaphore = self.semaphore
+        try:
+            await semaphore.acquire()
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self.blocked_until - now
+                    if delay <= 0:
+                        delay = self._take_token(now)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+            except BaseException:
+                semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        wait_time = time.monotonic() - requested_at
+        self.in_flight += 1
+        self.requests += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        return semaphore
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "backoff_seconds": max(0.0, self.blocked_until - time.monotonic()),
+            "wait_time_avg_ms": self.wait_time_total / self.requests * 1000 if self.requests else 0.0,
+            "wait_time_max_ms": self.wait_time_max * 1000,
+        }
+
+
+class HostScheduler:
+    """Process-wide politeness scheduler for outgoing scraper requests, keyed by host.
+
+    Every request to a host waits for a token from that host's bucket (requests_per_second with a
+    burst) and for one of its max_in_flight slots, whichever scraper instance makes it. When a host
+    answers 429 or 503, every request to it pauses for its Retry-After, or for an exponential backoff
+    if it sends none, until a request gets through again.
+
+    A host's rate limit comes from host_rate_limits or from set_rate_limit, which scrapers call with
+    their configured limit; it does not change per request. Hosts without one use default_rate_limit.
+    """
+
+    def __init__(
+        self,
+        default_rate_limit: RateLimit,
+        host_rate_limits: Optional[Dict[str, RateLimit]] = None,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 300.0,
+    ):
+        self.default_rate_limit = default_rate_limit
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._rate_limits: Dict[str, RateLimit] = dict(host_rate_limits or {})
+        self._hosts: Dict[str, HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlsplit(url).hostname or url).lower()
+
+    def set_rate_limit(self, url: str, rate_limit: RateLimit) -> None:
+        """Set the rate limit of the host of url; a host already in use switches to it if it changed."""
+        host = self.host_of(url)
+        self._rate_limits[host] = rate_limit
+        state = self._hosts.get(host)
+        if state is not None:
+            state.set_rate_limit(rate_limit)
+
+    def _state(self, url: str) -> HostState:
+        host = self.host_of(url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self._rate_limits.get(host, self.default_rate_limit))
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait until a request to the host of url is allowed, and hold an in-flight slot meanwhile."""
+        state = self._state(url)
+        semaphore = await state.acquire()
+        try:
+            yield
+        finally:
+            state.in_flight -= 1
+            semaphore.release()
+
+    def record_status(self, url: str, status: int, retry_after: Optional[str] = None) -> None:
+        """Report a response status; 429 and 503 make the host back off, anything else resets it."""
+        state = self._hosts.get(self.host_of(url))
+        if state is None:
+            return
+        if status not in THROTTLE_STATUSES:
+            state.consecutive_throttles = 0
+            return
+
+        state.throttled += 1
+        state.consecutive_throttles += 1
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.base_backoff_seconds * 2 ** (state.consecutive_throttles - 1)
+        delay = min(delay, self.max_backoff_seconds)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        print(f"Host {self.host_of(url)} throttled us ({status}); backing off for {delay:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight requests, backoff and wait times per host."""
+        return {host: state.stats() for host, state in self._hosts.items()}
+
+
+host_scheduler = HostScheduler(
+    RateLimit(
+        requests_per_second=settings.SCRAPER_REQUESTS_PER_SECOND,
+        burst=settings.SCRAPER_BURST,
+        max_in_flight=settings.SCRAPER_MAX_IN_FLIGHT_PER_HOST,
+    ),
+    # The ScraperAPI fallback of every source goes through this one host
+    host_rate_limits={
+        SCRAPERAPI_HOST: RateLimit(
+            requests_per_second=settings.SCRAPERAPI_REQUESTS_PER_SECOND,
+            burst=settings.SCRAPERAPI_MAX_IN_FLIGHT,
+            max_in_flight=settings.SCRAPERAPI_MAX_IN_FLIGHT,
+        )
+    },
+    max_backoff_seconds=settings.SCRAPER_MAX_BACKOFF_SECONDS,
+)
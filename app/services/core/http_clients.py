@@ -0,0 +1,264 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from contextlib import contextmanager
+from importlib.util import find_spec
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+import aiohttp
+import httpcore
+import httpx
+from app.core.config import settings
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that caches resolved addresses for ttl_seconds.
+
+    New connections to a host skip the lookup while its entry is fresh. TLS still uses the host name
+    for SNI and certificate checks, since httpcore passes it separately when starting TLS. If every
+    cached address refuses the connection, the entry is dropped so the next attempt resolves again.
+    """
+
+    def __init__(self, ttl_seconds: float, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.ttl_seconds = ttl_seconds
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._addresses: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._addresses.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        try:
+            infos = await self._getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._addresses[(host, port)] = (time.monotonic() + self.ttl_seconds, addresses)
+        return addresses
+
+    @staticmethod
+    async def _getaddrinfo(host: str, port: int, type: int) -> List[Any]:
+        return await asyncio.get_running_loop().getaddrinfo(host, port, type=type)
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        last_error: Optional[Exception] = None
+        for address in await self._resolve(host, port):
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        self._addresses.pop((host, port), None)
+        raise last_error or httpcore.ConnectError(f"No addresses found for {host}")
+
+    async def connect_unix_socket(
+        self, path: str, timeout: Optional[float] = None, socket_options: Optional[Iterable[Any]] = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._addresses), "hits": self.hits, "misses": self.misses}
+
+
+# httpcore exceptions and the httpx exceptions of the same name that clients catch
+HTTPCORE_EXCEPTIONS = {
+    getattr(httpcore, name): getattr(httpx, name)
+    for name in (
+        "ConnectTimeout",
+        "ReadTimeout",
+        "WriteTimeout",
+        "PoolTimeout",
+        "TimeoutException",
+        "ConnectError",
+        "ReadError",
+        "WriteError",
+        "NetworkError",
+        "ProxyError",
+        "UnsupportedProtocol",
+        "RemoteProtocolError",
+        "LocalProtocolError",
+        "ProtocolError",
+    )
+}
+
+
+@contextmanager
+def httpx_exceptions(request: httpx.Request) -> Iterator[None]:
+    """Re-raise httpcore exceptions as the matching httpx exceptions."""
+    try:
+        yield
+    except Exception as e:
+        for exception_class in type(e).__mro__:
+            if exception_class in HTTPCORE_EXCEPTIONS:
+                raise HTTPCORE_EXCEPTIONS[exception_class](str(e), request=request) from e
+        raise
+
+
+class ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with httpx_exceptions(self._request):
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class ConnectionPoolTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an httpcore connection pool built with our own network backend.
+
+    httpx.AsyncHTTPTransport does not take a network backend, so this plays its part using only the
+    public httpx and httpcore APIs.
+    """
+
+    def __init__(self, network_backend: httpcore.AsyncNetworkBackend, limits: httpx.Limits, http2: bool = False):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with httpx_exceptions(request):
+            response = await self._pool.handle_async_request(core_request)
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=ResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+class HttpClientRegistry:
+    """App-scoped HTTP clients shared by the scrapers and the storage service.
+
+    One httpx client serves every scrape, so TLS connections to a host are kept alive and reused
+    instead of being opened per request. It speaks HTTP/2 when enabled and the h2 package is
+    installed. Image downloads use one aiohttp session with a per-host connection limit. Both clients
+    cache DNS lookups, are created on first use and are closed in the app lifespan.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_seconds: float = 60.0,
+        http2: bool = True,
+        dns_cache_seconds: float = 300.0,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.http2 = http2 and find_spec("h2") is not None
+        self.dns_cache_seconds = dns_cache_seconds
+        self.dns = CachingDNSBackend(dns_cache_seconds)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """The shared httpx client. Pass per-request timeouts and headers instead of creating a client."""
+        if self._http is None or self._http.is_closed:
+            transport = ConnectionPoolTransport(
+                self.dns,
+                httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_seconds,
+                ),
+                http2=self.http2,
+            )
+            self._http = httpx.AsyncClient(transport=transport, follow_redirects=True)
+        return self._http
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session. Must be first used from within the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_seconds,
+                ttl_dns_cache=int(self.dns_cache_seconds),
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """Close both clients; they are created again if used afterwards."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Client settings and DNS cache counters."""
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "httpx_open": self._http is not None and not self._http.is_closed,
+            "aiohttp_open": self._session is not None and not self._session.closed,
+            "dns_cache": self.dns.stats(),
+        }
+
+
+http_clients = HttpClientRegistry(
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    max_connections_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    keepalive_seconds=settings.HTTP_KEEPALIVE_SECONDS,
+    http2=settings.HTTP2_ENABLED,
+    dns_cache_seconds=settings.HTTP_DNS_CACHE_SECONDS,
+)
@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.models.job import Job, JobStatus
+
+JobFunction = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class JobService:
+    """In-process registry of background jobs.
+
+    Jobs run as asyncio tasks on the server's event loop and report progress on their Job, which clients
+    poll by id. Only the most recent finished jobs are kept, and jobs don't survive a restart.
+    """
+
+    def __init__(self, max_finished_jobs: int = 100):
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, job_type: str, func: JobFunction) -> Job:
+        """Start func(job) in the background and return the job to poll."""
+        job = Job(id=uuid.uuid4().hex, type=job_type)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, func))
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id."""
+        return self._jobs.get(job_id)
+
+    def get_active(self, job_type: str) -> Optional[Job]:
+        """Get the pending or running job of a type, if any."""
+        for job in self._jobs.values():
+            if job.type == job_type and job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+                return job
+        return None
+
+    async def _run(self, job: Job, func: JobFunction) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = await func(job)
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.error = "Cancelled"
+            job.status = JobStatus.FAILED
+            raise
+        except Exception as e:
+            print(f"Job {job.type} {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._tasks.pop(job.id, None)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job_id not in self._tasks]
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel the jobs that are still running."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+job_service = JobService()
@@ -5,6 +5,8 @@ from typing import List, Dict, Optional, Tuple, Type, Any
 from pydantic import HttpUrl
 from app.models.novel import Chapter
 from .base_scraper import BaseScraper, ScraperConfig, ScraperError
+from .host_scheduler import host_scheduler
+from .http_clients import http_clients
 from ..scrapers.novelbin_scraper import NovelBinScraper
 from ..scrapers.pastebin_tbate_scraper import PastebinTBATEScraper
 from ..scrapers.generic_scraper import GenericScraper
@@ -36,22 +38,20 @@ async def fetch_html(url: str, timeout: float = 10.0) -> Optional[str]:
             print(f"Could not construct raw URL for {url}, proceeding with original URL")
 
     try:
-        # Create a client with timeout and limits
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timeout,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-        ) as client:
+        async with host_scheduler.slot(url):
             # Add a separate timeout using asyncio just to be safe
-            response = await asyncio.wait_for(client.get(url, headers=headers), timeout=timeout)
-            response.raise_for_status()
+            response = await asyncio.wait_for(
+                http_clients.http.get(url, headers=headers, timeout=timeout), timeout=timeout
+            )
+        host_scheduler.record_status(url, response.status_code, response.headers.get("retry-after"))
+        response.raise_for_status()
 
-            elapsed = time.time() - start_time
-            content_preview = response.text[:100] + "..." if len(response.text) > 100 else response.text
-            print(f"Received response from {url} in {elapsed:.2f} seconds")
-            print(f"Content preview: {content_preview}")
+        elapsed = time.time() - start_time
+        content_preview = response.text[:100] + "..." if len(response.text) > 100 else response.text
+        print(f"Received response from {url} in {elapsed:.2f} seconds")
+        print(f"Content preview: {content_preview}")
 
-            return response.text
+        return response.text
     except asyncio.TimeoutError:
         print(f"Asyncio timeout occurred after {time.time() - start_time:.2f} seconds for {url}")
         raise ScraperError(f"Request timed out for {url} after {timeout} seconds")
@@ -235,6 +235,8 @@ async def create_generic_scraper(config: ScraperConfig) -> GenericScraper:
         timeout=config.timeout,
         max_retries=config.max_retries,
         special_actions=config.special_actions,
+        rate_limit=config.rate_limit,
+        resource_policy=config.resource_policy,
     )
 
 
@@ -1,15 +1,17 @@
 import os
 import json
-import aiohttp
 import aiofiles
 from typing import Optional, Union, Dict, Any
 from pathlib import Path
 from app.db.database import get_database
+from app.repositories.novel_repository import NovelRepository
+from app.services.core.http_clients import HttpClientRegistry, http_clients
 from bson import ObjectId
 
 
 class StorageService:
-    def __init__(self):
+    def __init__(self, clients: HttpClientRegistry = http_clients):
+        self.clients = clients
         self.base_dir = Path("storage")
         self.novels_dir = self.base_dir / "novels"
         self._ensure_directories()
@@ -27,15 +29,15 @@ class StorageService:
         if self.db is None:
             self.db = get_database()
 
-        try:
-            novel_id = ObjectId(novel)
-            novel_doc = await self.db["novels"].find_one({"_id": novel_id})
-            if not novel_doc:
-                raise ValueError(f"Novel with id {novel} not found")
-            return novel_doc
-        except Exception:
+        if not ObjectId.is_valid(novel):
             raise ValueError(f"Invalid novel ID format: {novel}")
 
+        # Served from the novel cache, since every chapter read and save needs the title for its path
+        novel_doc = await NovelRepository(self.db).get_document(ObjectId(novel))
+        if not novel_doc:
+            raise ValueError(f"Novel with id {novel} not found")
+        return novel_doc
+
     async def _get_chapter_path(
         self, novel: Union[str, Dict[str, Any]], chapter_number: int, content_type: str, language: str = "en"
     ) -> Path:
@@ -125,29 +127,29 @@ class StorageService:
         images_dir = await self._get_manhwa_images_dir(novel, chapter_number)
         saved_images = []
 
-        async with aiohttp.ClientSession() as session:
-            for img in content["images"]:
-                try:
-                    # Download image
-                    async with session.get(img["url"]) as response:
-                        if response.status == 200:
-                            # Generate safe filename
-                            ext = os.path.splitext(img["url"])[1] or ".jpg"
-                            filename = f"image_{img['index']:03d}{ext}"
-                            filepath = images_dir / filename
-
-                            # Save image
-                            async with aiofiles.open(filepath, "wb") as f:
-                                await f.write(await response.read())
-
-                            # Update image info with local path
-                            saved_img = img.copy()
-                            saved_img["local_path"] = str(filepath)
-                            saved_images.append(saved_img)
-                except Exception as e:
-                    print(f"Error downloading image {img['url']}: {str(e)}")
-                    # Keep original image info if download fails
-                    saved_images.append(img)
+        session = self.clients.session
+        for img in content["images"]:
+            try:
+                # Download image
+                async with session.get(img["url"]) as response:
+                    if response.status == 200:
+                        # Generate safe filename
+                        ext = os.path.splitext(img["url"])[1] or ".jpg"
+                        filename = f"image_{img['index']:03d}{ext}"
+                        filepath = images_dir / filename
+
+                        # Save image
+                        async with aiofiles.open(filepath, "wb") as f:
+                            await f.write(await response.read())
+
+                        # Update image info with local path
+                        saved_img = img.copy()
+                        saved_img["local_path"] = str(filepath)
+                        saved_images.append(saved_img)
+            except Exception as e:
+                print(f"Error downloading image {img['url']}: {str(e)}")
+                # Keep original image info if download fails
+                saved_images.append(img)
 
         # Update content with local paths
         content["images"] = saved_images
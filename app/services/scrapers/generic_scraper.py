@@ -2,6 +2,7 @@ from typing import List, Dict, Optional, Any, Union
 from bs4 import BeautifulSoup
 import re
 from app.models.novel import Chapter
+from app.models.source import RateLimit, ResourcePolicy
 from ..core.base_scraper import BaseScraper, ScraperConfig
 import asyncio
 
@@ -21,6 +22,8 @@ class GenericScraper(BaseScraper):
         timeout: float = 10.0,
         max_retries: int = 3,
         special_actions: Optional[Dict[str, Dict[str, Any]]] = None,
+        rate_limit: Optional[RateLimit] = None,
+        resource_policy: Optional[ResourcePolicy] = None,
     ):
         # Default selectors for novels
         default_selectors = {
@@ -65,6 +68,12 @@ class GenericScraper(BaseScraper):
         if special_actions:
             default_special_actions.update(special_actions)
 
+        if resource_policy is None:
+            resource_policy = ResourcePolicy()
+            if content_type != "novel":
+                # Lazy-loading readers may only reveal the next image once the previous one has loaded
+                resource_policy.blocked_resource_types.remove("image")
+
         config = ScraperConfig(
             name=name,
             base_url=base_url,
@@ -76,6 +85,8 @@ class GenericScraper(BaseScraper):
             timeout=timeout,
             max_retries=max_retries,
             special_actions=default_special_actions,
+            rate_limit=rate_limit,
+            resource_policy=resource_policy,
         )
 
         super().__init__(config)
@@ -117,7 +128,7 @@ class GenericScraper(BaseScraper):
         """Get all chapters from the source."""
         async with self:
             if self.config.use_playwright and self._page:
-                await self._page.goto(url)
+                await self.goto(url)
 
                 # Handle special actions like "view all" button
                 if self.config.special_actions["view_all"]["enabled"]:
@@ -78,7 +78,7 @@ class ManhwaWebScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
 
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
 
             # Esperar a que el título esté visible
@@ -135,7 +135,7 @@ class ManhwaWebScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
 
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
 
             # Esperar a que la lista de capítulos esté visible
@@ -219,7 +219,7 @@ class ManhwaWebScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
 
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
 
             # Esperar a que el contenedor de imágenes esté visible
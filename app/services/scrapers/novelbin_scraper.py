@@ -1,6 +1,7 @@
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 from app.models.novel import Chapter
+from app.models.source import RateLimit, ResourcePolicy
 import re
 from ..core.base_scraper import BaseScraper, ScraperConfig
 
@@ -35,6 +36,8 @@ class NovelBinScraper(BaseScraper):
                 ],
             },
             use_playwright=True,  # NovelBin requires JavaScript for chapter list
+            rate_limit=RateLimit(requests_per_second=0.5, burst=2, max_in_flight=2),
+            resource_policy=ResourcePolicy(),
         )
         super().__init__(config)
 
@@ -78,7 +81,7 @@ class NovelBinScraper(BaseScraper):
             playwright_error = None
             try:
                 # Navigate to the page
-                await self._page.goto(url + "#tab-chapters-title")
+                await self.goto(url + "#tab-chapters-title")
                 await self._page.wait_for_selector(self.config.selectors["chapter_list"], timeout=50000)
                 try:
                     await self._page.wait_for_selector(self.config.selectors["chapter_list"], timeout=50000)
@@ -106,7 +109,6 @@ class NovelBinScraper(BaseScraper):
                 playwright_error = e
                 print(f"Error con Playwright: {e}. Intentando con ScraperAPI...")
                 try:
-                    import httpx
                     from app.core.config import settings
 
                     payload = {
@@ -117,17 +119,16 @@ class NovelBinScraper(BaseScraper):
                         "timeout": "60000",  # 60 segundos de timeout
                     }
 
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get("https://api.scraperapi.com/", params=payload, timeout=100000)
-                        response.raise_for_status()
-                        content = response.text
-
-                        # Debug info
-                        if len(content) < 1000:  # Si el contenido es muy pequeño, probablemente hay un error
-                            print(f"Warning: Content length is very small ({len(content)} bytes)")
-                            print(f"Response status: {response.status_code}")
-                            print(f"Response headers: {response.headers}")
-                            raise ValueError("Response content too small, might be an error page")
+                    response = await self.http_get("https://api.scraperapi.com/", params=payload, timeout=100000)
+                    response.raise_for_status()
+                    content = response.text
+
+                    # Debug info
+                    if len(content) < 1000:  # Si el contenido es muy pequeño, probablemente hay un error
+                        print(f"Warning: Content length is very small ({len(content)} bytes)")
+                        print(f"Response status: {response.status_code}")
+                        print(f"Response headers: {response.headers}")
+                        raise ValueError("Response content too small, might be an error page")
 
                     soup = BeautifulSoup(content, "html.parser")
                     print("novelbin scrapper (scraperapi)")
@@ -3,6 +3,7 @@ import time
 from typing import List, Optional, Tuple, Dict, Any
 from pydantic import HttpUrl
 from app.models.novel import Chapter
+from app.models.source import RateLimit
 from app.services import BaseScraper, ScraperConfig
 from app.services.core.storage_service import storage_service
 
@@ -26,6 +27,7 @@ class PastebinTBATEScraper(BaseScraper):
                 ],
             },
             use_playwright=False,
+            rate_limit=RateLimit(requests_per_second=1.0, burst=2, max_in_flight=1),
         )
         super().__init__(config)
         self.timeout = 15.0  # 15-second timeout for requests
@@ -2,6 +2,7 @@ from typing import List, Optional, Dict, Any
 from bs4 import BeautifulSoup
 import re
 from app.models.novel import Chapter
+from app.models.source import ResourcePolicy
 from ..core.base_scraper import BaseScraper, ScraperConfig
 from ..core.storage_service import storage_service
 import asyncio
@@ -53,6 +54,7 @@ class SkyNovelsScraper(BaseScraper):
                 ],
             },
             use_playwright=True,
+            resource_policy=ResourcePolicy(),
         )
         super().__init__(config)
 
@@ -94,7 +96,7 @@ class SkyNovelsScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
 
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
 
             # Esperar a que el contenido principal esté visible
@@ -175,7 +177,7 @@ class SkyNovelsScraper(BaseScraper):
                 raise RuntimeError("Playwright page not initialized")
 
             print(f"Obteniendo capítulos de: {url}")
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
 
             # Esperar a que el contenido principal esté visible
@@ -377,7 +379,7 @@ class SkyNovelsScraper(BaseScraper):
                 raise RuntimeError("Playwright page not initialized")
 
             print(f"Obteniendo contenido del capítulo en: {url}")
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
 
             try:
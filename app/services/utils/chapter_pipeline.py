@@ -0,0 +1,78 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+
+@dataclass(eq=False)
+class ChapterResult:
+    """A chapter going through the pipeline; each stage reads and replaces content."""
+
+    chapter: Any
+    content: Any = None
+    cached: bool = False  # Content came from storage and is already cleaned
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[ChapterResult], Awaitable[None]]
+    workers: int = 1
+
+
+class ChapterPipeline:
+    """Runs chapters through stages, e.g. fetch → clean → translate, connected by bounded queues.
+
+    Each stage has its own number of workers, so chapter 2 is fetched while chapter 1 is translated.
+    Results come back in the order of the input. A chapter whose stage raises is marked with the error
+    and skips the remaining stages; the rest of the batch carries on.
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 0):
+        self.stages = list(stages)
+        # Bounds how far a fast stage runs ahead of the next one; 0 means as far as it likes
+        self.queue_size = queue_size
+
+    async def run(self, chapters: Sequence[Any]) -> List[ChapterResult]:
+        results = [ChapterResult(chapter) for chapter in chapters]
+        if not self.stages:
+            return results
+
+        queues: List[asyncio.Queue] = [asyncio.Queue(self.queue_size) for _ in self.stages]
+
+        async def work(index: int) -> None:
+            stage = self.stages[index]
+            while True:
+                result = await queues[index].get()
+                if result is None:
+                    return
+                try:
+                    await stage.run(result)
+                except Exception as e:
+                    result.error = f"{stage.name}: {e}"
+                    print(f"Error processing chapter {getattr(result.chapter, 'chapter_number', '?')}: {result.error}")
+                    continue
+                if index + 1 < len(self.stages):
+                    await queues[index + 1].put(result)
+
+        workers = [
+            [asyncio.create_task(work(index)) for _ in range(max(1, stage.workers))]
+            for index, stage in enumerate(self.stages)
+        ]
+        try:
+            for result in results:
+                await queues[0].put(result)
+            # A stage is finished once the previous one is and its queue is drained
+            for index, stage_workers in enumerate(workers):
+                for _ in stage_workers:
+                    await queues[index].put(None)
+                await asyncio.gather(*stage_workers)
+        finally:
+            for task in (task for stage_workers in workers for task in stage_workers):
+                task.cancel()
+
+        return results
@@ -1,13 +1,16 @@
 from ebooklib import epub
 from typing import List, Optional, Tuple
+from app.core.config import settings
 from app.models.novel import Chapter
 import os
 import tempfile
 import re
 from pydantic import HttpUrl
+from .chapter_pipeline import ChapterPipeline, ChapterResult, Stage
 from .translation_service import translation_service
 from ..core.scraper_service import scrape_chapter_content, ScraperError
 from ..core.storage_service import storage_service
+from app.repositories.chapter_index import select_chapter_range
 
 
 class EpubService:
@@ -89,6 +92,39 @@ class EpubService:
 
         return "\n".join(cleaned_lines)
 
+    def chapter_pipeline(self, novel_id: str, source_name: str, translate: bool = False) -> ChapterPipeline:
+        """Pipeline que obtiene (de storage o de la fuente), limpia y opcionalmente traduce capítulos."""
+
+        async def fetch(result: ChapterResult) -> None:
+            chapter = result.chapter
+            cached_content = await storage_service.get_chapter(novel_id, chapter.chapter_number, "raw")
+            if cached_content:
+                # Storage keeps chapters already cleaned
+                result.content, result.cached = cached_content, True
+            else:
+                result.content = await self.fetch_chapter_content(
+                    chapter.url, source_name, novel_id, chapter.chapter_number
+                )
+
+        async def clean(result: ChapterResult) -> None:
+            if result.cached:
+                return
+            result.content = self.clean_content(result.content)
+            await storage_service.save_chapter(novel_id, result.chapter.chapter_number, result.content, "raw")
+
+        async def translate_content(result: ChapterResult) -> None:
+            translated_content = await translation_service.translate_text(result.content)
+            if translated_content:
+                result.content = translated_content
+
+        stages = [
+            Stage("fetch", fetch, settings.CHAPTER_FETCH_WORKERS),
+            Stage("clean", clean, settings.CHAPTER_CLEAN_WORKERS),
+        ]
+        if translate:
+            stages.append(Stage("translate", translate_content, settings.CHAPTER_TRANSLATE_WORKERS))
+        return ChapterPipeline(stages, queue_size=settings.CHAPTER_PIPELINE_QUEUE_SIZE)
+
     def _get_epub_filename(
         self,
         novel_id: str,
@@ -115,16 +151,18 @@ class EpubService:
         end_chapter: Optional[int] = None,
         single_chapter: Optional[int] = None,
         translate: bool = False,
-    ) -> tuple[bytes, str]:
+    ) -> tuple[bytes, str, List[ChapterResult]]:
         """
         Create an EPUB file with the specified chapters.
         If translate is True, the content will be translated to Spanish.
+        Chapters are fetched concurrently; the ones that failed are returned and left out of the EPUB.
+        chapters must be in chapter order, as the repository returns them.
         """
         # Check if we have a cached version
         if single_chapter:
             cached_content = await storage_service.get_chapter(novel_id, single_chapter, "epub")
             if cached_content:
-                return cached_content, self._get_epub_filename(novel_id, single_chapter=single_chapter)
+                return cached_content, self._get_epub_filename(novel_id, single_chapter=single_chapter), []
 
         book = epub.EpubBook()
 
@@ -143,56 +181,35 @@ class EpubService:
         if single_chapter is not None:
             chapters = [c for c in chapters if c.chapter_number == single_chapter]
         elif start_chapter is not None or end_chapter is not None:
-            chapters = [
-                c
-                for c in chapters
-                if (start_chapter is None or c.chapter_number >= start_chapter)
-                and (end_chapter is None or c.chapter_number <= end_chapter)
-            ]
+            chapters = select_chapter_range(chapters, start_chapter, end_chapter)
 
-        for chapter in chapters:
-            try:
-                # Check if we have cached content
-                cached_content = await storage_service.get_chapter(novel_id, chapter.chapter_number, "raw")
-                if cached_content:
-                    raw_content = cached_content
-                else:
-                    # Fetch and clean chapter content
-                    raw_content = await self.fetch_chapter_content(
-                        chapter.url, source_name, novel_id, chapter.chapter_number
-                    )
-                    cleaned_content = self.clean_content(raw_content)
-                    # Cache the raw content
-                    await storage_service.save_chapter(novel_id, chapter.chapter_number, cleaned_content, "raw")
-
-                # Create chapter content
-                content = f"<h1>Chapter {chapter.chapter_number}</h1>"
-                if chapter.chapter_title:
-                    content += f"<h2>{chapter.chapter_title}</h2>"
-
-                # Add chapter content with optional translation
-                if translate:
-                    translated_content = await translation_service.translate_text(cleaned_content)
-                    content += f"<div>{translated_content if translated_content else cleaned_content}</div>"
-                else:
-                    content += f"<div>{cleaned_content}</div>"
-
-                # Create epub chapter
-                epub_chapter = epub.EpubHtml(
-                    title=f"Chapter {chapter.chapter_number}",
-                    file_name=f"chapter_{chapter.chapter_number}.xhtml",
-                    content=content,
-                )
-                book.add_item(epub_chapter)
-                epub_chapters.append(epub_chapter)
-                toc.append(epub_chapter)
-                spine.append(epub_chapter)
-            except Exception as e:
-                print(f"Error processing chapter {chapter.chapter_number}: {str(e)}")
+        # Results come back in chapter order, whatever order they finished in
+        results = await self.chapter_pipeline(novel_id, source_name, translate).run(chapters)
+        for result in results:
+            if not result.ok:
                 continue
+            chapter = result.chapter
+
+            # Create chapter content
+            content = f"<h1>Chapter {chapter.chapter_number}</h1>"
+            if chapter.chapter_title:
+                content += f"<h2>{chapter.chapter_title}</h2>"
+            content += f"<div>{result.content}</div>"
+
+            # Create epub chapter
+            epub_chapter = epub.EpubHtml(
+                title=f"Chapter {chapter.chapter_number}",
+                file_name=f"chapter_{chapter.chapter_number}.xhtml",
+                content=content,
+            )
+            book.add_item(epub_chapter)
+            epub_chapters.append(epub_chapter)
+            toc.append(epub_chapter)
+            spine.append(epub_chapter)
 
         if not epub_chapters:
             raise Exception("No chapters were successfully processed")
+        failures = [result for result in results if not result.ok]
 
         # Add table of contents
         book.toc = toc
@@ -224,17 +241,19 @@ class EpubService:
         # Clean up
         os.remove(filename)
 
-        return epub_bytes, filename
+        return epub_bytes, filename, failures
 
     async def generate_all_epubs(
         self, novel_id: str, novel_title: str, author: str, chapters: List[Chapter]
     ) -> List[Tuple[bytes, str]]:
         """Genera EPUBs para todos los capítulos y rangos posibles en memoria."""
         generated_epubs = []
+        # Ordenados una sola vez para todos los EPUB que se generan a partir de ellos
+        chapters = sorted(chapters, key=lambda chapter: chapter.chapter_number)
 
         # Generar EPUB para cada capítulo individual
         for chapter in chapters:
-            epub_bytes, filename = await self.create_epub(
+            epub_bytes, filename, _ = await self.create_epub(
                 novel_id=novel_id,
                 novel_title=novel_title,
                 author=author,
@@ -245,12 +264,12 @@ class EpubService:
             generated_epubs.append((epub_bytes, filename))
 
         # Generar EPUB para rangos de capítulos (cada 10 capítulos)
-        chapter_numbers = sorted([c.chapter_number for c in chapters])
+        chapter_numbers = [c.chapter_number for c in chapters]
         for i in range(0, len(chapter_numbers), 10):
             start = chapter_numbers[i]
             end = chapter_numbers[min(i + 9, len(chapter_numbers) - 1)]
 
-            epub_bytes, filename = await self.create_epub(
+            epub_bytes, filename, _ = await self.create_epub(
                 novel_id=novel_id,
                 novel_title=novel_title,
                 author=author,
@@ -262,7 +281,7 @@ class EpubService:
             generated_epubs.append((epub_bytes, filename))
 
         # Generar EPUB completo
-        epub_bytes, filename = await self.create_epub(
+        epub_bytes, filename, _ = await self.create_epub(
             novel_id=novel_id,
             novel_title=novel_title,
             author=author,
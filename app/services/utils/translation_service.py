@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 import deepl
 from bs4 import BeautifulSoup
@@ -136,7 +137,9 @@ class TranslationService:
                 if self.usage.character.count >= self.usage.character.limit:
                     raise ValueError("Límite de caracteres de DeepL alcanzado")
 
-                result = self.translator.translate_text(
+                # The DeepL client is blocking; run it in a thread so translations can overlap
+                result = await asyncio.to_thread(
+                    self.translator.translate_text,
                     text,
                     target_lang=self.target_language,
                     tag_handling="html",
@@ -151,10 +154,13 @@ class TranslationService:
                 # Split text into chunks while preserving HTML
                 chunks = self._split_text_into_chunks(text)
                 translated_chunks = []
+                # GoogleTranslator keeps the text of the request on the instance, so chapters translated
+                # at the same time cannot share one
+                translator = GoogleTranslator(source="en", target=self.target_language.lower())
 
                 for chunk in chunks:
                     try:
-                        result = self.translator.translate(chunk)
+                        result = await asyncio.to_thread(translator.translate, chunk)
                         translated_chunks.append(result)
                     except Exception as e:
                         print(f"Error translating chunk with Google Translate: {str(e)}")
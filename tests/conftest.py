@@ -1,8 +1,13 @@
+import asyncio
 import pytest
 from httpx import AsyncClient  # Usamos AsyncClient de httpx para manejo asíncrono
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.main import app
+from app.models.chapter import ChapterCreate
+from app.services.core.browser_pool import BrowserPool
 from app.db.database import get_database
+from app.repositories.cache import repository_caches
+from app.repositories.novel_search import novel_search_index
 from tests.data import SOURCES_DATA, NOVELS_DATA
 
 
@@ -22,6 +27,10 @@ async def test_db():
     collections = await db.list_collection_names()
     for coll in collections:
         await db[coll].delete_many({})
+    # El índice de búsqueda y las cachés viven en memoria y no se enteran de los borrados directos
+    novel_search_index.invalidate()
+    for cache in repository_caches.values():
+        cache.invalidate()
 
     yield db
 
@@ -92,6 +101,22 @@ async def created_novels(client, all_novels_data):
     return novels
 
 
+@pytest.fixture
+def make_chapter():
+    """Fixture que construye el ChapterCreate de un capítulo de Shadow Slave a partir de su número."""
+
+    def create(novel_id, number):
+        return ChapterCreate(
+            novel_id=novel_id,
+            title=f"Chapter {number}",
+            chapter_number=number,
+            url=f"https://novelbin.com/b/shadow-slave/chapter-{number}",
+            content_type="novel",
+        )
+
+    return create
+
+
 @pytest.fixture
 async def created_sources(client, all_sources_data):
     """Fixture que crea todas las fuentes en la base de datos y las devuelve."""
@@ -101,3 +126,59 @@ async def created_sources(client, all_sources_data):
         assert response.status_code == 201
         sources.append(response.json())
     return sources
+
+
+class FakePage:
+    def __init__(self):
+        self.url = None
+
+    async def goto(self, url):
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self, user_agent, page_class):
+        self.user_agent = user_agent
+        self.page_class = page_class
+        self.closed = False
+
+    async def new_page(self):
+        return self.page_class()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, page_class, context_delay=0.0):
+        self.page_class = page_class
+        self.context_delay = context_delay
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, user_agent=None):
+        await asyncio.sleep(self.context_delay)
+        if self.closed:
+            raise RuntimeError("Browser has been closed")
+        context = FakeContext(user_agent, self.page_class)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_pool():
+    """Fixture que crea un BrowserPool sobre navegadores falsos y devuelve también los navegadores lanzados."""
+
+    def create(page_class=FakePage, context_delay=0.0, **kwargs):
+        launched = []
+
+        async def launcher():
+            launched.append(FakeBrowser(page_class, context_delay))
+            return launched[-1]
+
+        return BrowserPool(launcher=launcher, **kwargs), launched
+
+    return create
@@ -0,0 +1,141 @@
+import asyncio
+import time
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from passlib.context import CryptContext
+from app.core.security import password_hasher
+from app.db.migrations import backfill_normalized_emails
+from app.models.user import UserRole, UserUpdate
+from app.repositories.cache import PrincipalCache, principal_cache
+from app.repositories.user_repository import UserRepository
+
+# Coste reducido para que los tests sean rápidos; sigue bloqueando lo suficiente para medir el lag
+LOGIN_BCRYPT_ROUNDS = 8
+CONCURRENT_LOGINS = 50
+
+reader_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=LOGIN_BCRYPT_ROUNDS)
+
+
+@pytest.fixture
+async def reader(test_db):
+    """Fixture que crea un usuario con contraseña "secreto" y devuelve su documento."""
+    user = {
+        "username": "lector",
+        "email": "lector@example.com",
+        "email_normalized": "lector@example.com",
+        "hashed_password": reader_context.hash("secreto"),
+        "is_active": True,
+        "created_at": datetime.utcnow(),
+    }
+    await test_db.users.insert_one(user)
+    return user
+
+
+async def login(client, username: str = "lector", password: str = "secreto"):
+    return await client.post("api/v1/auth/token", data={"username": username, "password": password})
+
+
+@pytest.mark.anyio
+async def test_concurrent_logins_do_not_block_event_loop(client, reader):
+    """Test que verifica que bcrypt corre fuera del event loop durante 50 logins concurrentes."""
+    # Lo que bloquearía el loop cada login si bcrypt corriera en él
+    start = time.perf_counter()
+    reader_context.verify("secreto", reader["hashed_password"])
+    verify_time = time.perf_counter() - start
+
+    loop = asyncio.get_running_loop()
+    lags = []
+    done = asyncio.Event()
+
+    async def measure_lag():
+        while not done.is_set():
+            start = loop.time()
+            await asyncio.sleep(0.001)
+            lags.append(loop.time() - start - 0.001)
+
+    monitor = asyncio.create_task(measure_lag())
+    completed_before = password_hasher.completed
+    responses = await asyncio.gather(*(login(client) for _ in range(CONCURRENT_LOGINS)))
+    done.set()
+    await monitor
+
+    assert all(response.status_code == 200 for response in responses)
+    assert password_hasher.completed - completed_before == CONCURRENT_LOGINS
+    # Con bcrypt en el loop, cada login lo detendría verify_time; el planificador del SO aún puede
+    # introducir picos aislados, así que se comprueba el percentil 90
+    lags.sort()
+    assert len(lags) > CONCURRENT_LOGINS
+    assert lags[len(lags) * 9 // 10] < verify_time / 2
+
+
+@pytest.mark.anyio
+async def test_principal_cache_follows_user_writes(client, test_db, reader):
+    """Test que verifica que el usuario del token se cachea y se invalida al cambiar el rol y al cerrar sesión."""
+    response = await login(client)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.get("api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["role"] == "user"
+
+    # La segunda petición no consulta la colección de usuarios
+    hits = principal_cache.hits
+    response = await client.get("api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert principal_cache.hits == hits + 1
+
+    # Un cambio de rol se aplica en la siguiente petición
+    await UserRepository(test_db).update(reader["_id"], UserUpdate(role=UserRole.ADMIN))
+    response = await client.get("api/v1/auth/me", headers=headers)
+    assert response.json()["role"] == "admin"
+
+    response = await client.post("api/v1/auth/logout", headers=headers)
+    assert response.status_code == 204
+    stored = await test_db.users.find_one({"_id": reader["_id"]})
+    assert stored["refresh_token"] is None
+
+
+@pytest.mark.anyio
+async def test_login_by_email_is_exact_and_case_insensitive(client, test_db, reader):
+    """Test que verifica el login por email tras migrar usuarios antiguos sin email normalizado."""
+    # Usuario guardado antes de existir email_normalized
+    await test_db.users.insert_one(
+        {
+            "username": "antiguo",
+            "email": "Antiguo.Lector@Example.com",
+            "hashed_password": reader_context.hash("secreto"),
+            "created_at": datetime.utcnow(),
+        }
+    )
+    await backfill_normalized_emails(test_db, batch_size=1)
+
+    response = await login(client, "antiguo.lector@EXAMPLE.com")
+    assert response.status_code == 200
+
+    # Una parte del email ya no coincide
+    response = await login(client, "lector@example")
+    assert response.status_code == 401
+
+
+def test_principal_cache_user_generations_are_bounded():
+    """Test que verifica que las generaciones por usuario no crecen sin límite y se olvidan al invalidar todo."""
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    principal = SimpleNamespace(id="usuario")
+
+    cache.put("token", principal, cache.generation(principal.id))
+    assert cache.get("token") is principal
+
+    # Una carga que empezó antes de una escritura no se cachea, aunque se olviden las generaciones
+    generation = cache.generation(principal.id)
+    for user_id in ("usuario", "otro", "tercero"):
+        cache.invalidate_user(user_id)
+    assert len(cache._user_generations) == 0
+    cache.put("token", principal, generation)
+    assert cache.get("token") is None
+
+    cache.put("token", principal, cache.generation(principal.id))
+    cache.invalidate_user("otro")
+    cache.invalidate()
+    assert cache._user_generations == {}
+    assert cache.get("token") is None
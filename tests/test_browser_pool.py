@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+
+
+@pytest.mark.anyio
+async def test_browser_and_context_are_reused(fake_pool):
+    """Test que verifica que los scrapes consecutivos comparten navegador y contexto."""
+    pool, launched = fake_pool(max_pages=2)
+
+    for _ in range(5):
+        lease = await pool.acquire(user_agent="agente")
+        await pool.release(lease)
+
+    assert len(launched) == 1
+    assert len(launched[0].contexts) == 1
+    assert lease.page.url == "about:blank"
+
+    # Un scrape fallido no devuelve su contexto al pool
+    lease = await pool.acquire()
+    await pool.release(lease, reusable=False)
+    assert lease.context.closed
+    assert pool.stats()["idle_pages"] == 0
+
+    await pool.close()
+    assert launched[0].closed
+
+
+@pytest.mark.anyio
+async def test_pages_are_bounded_and_browsers_recycled(fake_pool):
+    """Test que verifica el límite de páginas simultáneas y el reciclado del navegador."""
+    pool, launched = fake_pool(max_pages=2, recycle_after_pages=3)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    waiting = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    await pool.release(first)
+    third = await waiting
+    assert third.context is first.context
+    assert pool.stats()["active_pages"] == 2
+
+    # Tras 3 préstamos el navegador se retira y se cierra al devolver su última página
+    await pool.release(second)
+    await pool.release(third)
+    fourth = await pool.acquire()
+    assert len(launched) == 2
+    assert launched[0].closed
+    assert fourth.browser.browser is launched[1]
+    await pool.release(fourth)
+
+    stats = pool.stats()
+    assert stats["browsers"] == 1
+    assert stats["browsers_recycled"] == 1
+    assert stats["leases"] == 4
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_browser_is_not_closed_while_a_context_opens(fake_pool):
+    """Test que verifica que retirar un navegador no lo cierra mientras se le abre un contexto."""
+    pool, launched = fake_pool(context_delay=0.05, max_pages=2, recycle_after_seconds=0)
+
+    # El primer préstamo abre su contexto despacio; entretanto otro préstamo retira el navegador
+    first = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    second = await pool.acquire()
+    first = await first
+
+    assert first.browser.browser is launched[0]
+    assert not launched[0].closed
+    await pool.release(first)
+    assert launched[0].closed
+    await pool.release(second)
+    await pool.close()
@@ -0,0 +1,37 @@
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from app.services.utils.chapter_pipeline import ChapterPipeline, Stage
+
+STAGE_DELAY = 0.05
+
+
+@pytest.mark.anyio
+async def test_pipeline_keeps_order_and_isolates_failures():
+    """Test que verifica que el pipeline es concurrente, conserva el orden y aísla los fallos."""
+    chapters = [SimpleNamespace(chapter_number=number) for number in range(1, 11)]
+
+    async def fetch(result):
+        # Los capítulos bajos tardan más, así que terminan fuera de orden
+        await asyncio.sleep(STAGE_DELAY * (11 - result.chapter.chapter_number) / 10)
+        if result.chapter.chapter_number == 4:
+            raise ValueError("404")
+        result.content = f"raw {result.chapter.chapter_number}"
+
+    async def translate(result):
+        await asyncio.sleep(STAGE_DELAY)
+        result.content = result.content.replace("raw", "traducido")
+
+    pipeline = ChapterPipeline([Stage("fetch", fetch, workers=4), Stage("translate", translate, workers=4)], 2)
+    start = time.perf_counter()
+    results = await pipeline.run(chapters)
+    elapsed = time.perf_counter() - start
+
+    assert [result.chapter.chapter_number for result in results] == list(range(1, 11))
+    assert [result.content for result in results if result.ok] == [
+        f"traducido {number}" for number in range(1, 11) if number != 4
+    ]
+    assert results[3].error == "fetch: 404"
+    # En serie serían unos 20 retardos; con 4 trabajadores por etapa bastan unos pocos
+    assert elapsed < STAGE_DELAY * 8
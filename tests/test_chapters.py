@@ -1,4 +1,5 @@
 import pytest
+from app.repositories.novel_repository import NovelRepository
 
 
 @pytest.mark.anyio
@@ -9,3 +10,63 @@ async def test_fetch_chapters(client, created_sources, created_novels):
     assert response.status_code == 200
     chapters = response.json()
     assert len(chapters) > 0
+
+
+@pytest.mark.anyio
+async def test_get_chapters_with_cursor(client, test_db, created_novels, make_chapter):
+    """Test que verifica la paginación por cursor de los capítulos de una novela."""
+    novel_id = created_novels[1]["_id"]
+    chapter_repository = NovelRepository(test_db).chapter_repository
+    await chapter_repository.bulk_upsert_chapters(novel_id, [make_chapter(novel_id, number) for number in range(1, 6)])
+
+    seen = []
+    params = {"page_size": 2, "sort_order": "asc"}
+    while True:
+        response = await client.get(f"api/v1/novels/{novel_id}/chapters", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total"] == 5
+        seen.extend(chapter["chapter_number"] for chapter in page["chapters"])
+        if not page["next_cursor"]:
+            break
+        params = {"page_size": 2, "cursor": page["next_cursor"]}
+
+    assert seen == [1, 2, 3, 4, 5]
+
+    response = await client.get(f"api/v1/novels/{novel_id}/chapters", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_get_chapters_summary(client, test_db, created_novels, make_chapter):
+    """Test que verifica que la lista resumida de capítulos solo devuelve los campos ligeros."""
+    novel_id = created_novels[1]["_id"]
+    await NovelRepository(test_db).chapter_repository.create(make_chapter(novel_id, 1))
+
+    response = await client.get(f"api/v1/novels/{novel_id}/chapters", params={"summary": True})
+    assert response.status_code == 200
+    chapter = response.json()["chapters"][0]
+    assert chapter["chapter_number"] == 1
+    assert "url" not in chapter
+
+
+@pytest.mark.anyio
+async def test_next_and_previous_chapter(client, test_db, created_novels, make_chapter):
+    """Test que verifica la navegación entre capítulos y que el índice se invalida al borrar."""
+    novel_id = created_novels[1]["_id"]
+    chapter_repository = NovelRepository(test_db).chapter_repository
+    chapters = {}
+    for number in (1, 2, 5):
+        chapters[number] = await chapter_repository.create(make_chapter(novel_id, number))
+
+    response = await client.get(f"api/v1/novels/{novel_id}/chapters/2/next")
+    assert response.status_code == 200
+    assert response.json()["chapter_number"] == 5
+
+    response = await client.get(f"api/v1/novels/{novel_id}/chapters/2/previous")
+    assert response.status_code == 200
+    assert response.json()["chapter_number"] == 1
+
+    await chapter_repository.delete(chapters[5].id)
+    response = await client.get(f"api/v1/novels/{novel_id}/chapters/2/next")
+    assert response.status_code == 404
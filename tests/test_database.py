@@ -1,5 +1,11 @@
+from datetime import datetime, timedelta
 import pytest
+from bson import ObjectId
+from pymongo import ASCENDING
 from app.db.database import db_manager, connect_to_mongo, close_mongo_connection
+from app.core.config import settings
+from app.db.indexes import INDEXES, drop_conflicting_index, failed_indexes
+from app.db.migrations import migrate_database, run_migrations, MIGRATIONS, MIGRATIONS_COLLECTION
 
 
 @pytest.mark.asyncio
@@ -25,3 +31,88 @@ async def test_connect_to_mongo():
     # Verificar que la conexión fue cerrada
     assert db_manager.client is None
     assert db_manager.db is None
+
+
+@pytest.mark.asyncio
+async def test_migrate_database_is_idempotent(test_db):
+    # Aplicar migraciones e índices dos veces no debe fallar
+    await migrate_database(test_db)
+    await migrate_database(test_db)
+
+    # Comprobar que los índices registrados existen
+    for collection_name, indexes in INDEXES.items():
+        index_info = await test_db[collection_name].index_information()
+        for index in indexes:
+            assert index.document["name"] in index_info
+
+    # Comprobar que cada migración quedó registrada una sola vez
+    applied = await test_db[MIGRATIONS_COLLECTION].find().to_list(length=None)
+    assert sorted(m["_id"] for m in applied) == sorted(m.version for m in MIGRATIONS)
+    assert all(m["status"] == "applied" for m in applied)
+
+
+@pytest.mark.asyncio
+async def test_stale_migration_claim_is_taken_over(test_db):
+    # Un trabajador murió a mitad de la migración 1 y otro tiene la 2 en curso
+    now = datetime.utcnow()
+    await test_db[MIGRATIONS_COLLECTION].insert_many(
+        [
+            {"_id": 1, "status": "running", "lease_expires_at": now - timedelta(minutes=1)},
+            {"_id": 2, "status": "running", "lease_expires_at": now + timedelta(minutes=5)},
+        ]
+    )
+
+    applied = await run_migrations(test_db)
+
+    # La reclamación caducada se retoma; la vigente se respeta
+    assert 1 in applied
+    assert 2 not in applied
+    migrations = {m["_id"]: m for m in await test_db[MIGRATIONS_COLLECTION].find().to_list(length=None)}
+    assert migrations[1]["status"] == "applied"
+    assert migrations[2]["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_conflicting_index_with_other_name_is_dropped(test_db):
+    # Un índice antiguo sobre las mismas claves pero con otro nombre y sin unique
+    await test_db.sources.create_index([("name", ASCENDING)], name="name_1")
+
+    await drop_conflicting_index(test_db.sources, INDEXES["sources"][0])
+
+    # Se localiza por el patrón de claves y se borra por su nombre real
+    assert "name_1" not in await test_db.sources.index_information()
+
+
+@pytest.mark.anyio
+async def test_unique_index_on_duplicates_is_reported(client, test_db, caplog):
+    # Dos capítulos con el mismo número impiden crear el índice único
+    novel_id = str(ObjectId())
+    await test_db.chapters.insert_many([{"novel_id": novel_id, "chapter_number": 1} for _ in range(2)])
+
+    try:
+        await migrate_database(test_db)
+
+        assert "chapters.novel_chapter_number_unique" in failed_indexes
+        assert any(record.levelname == "ERROR" and "duplicate" in record.getMessage() for record in caplog.records)
+        health = (await client.get("api/v1/health")).json()
+        assert health["status"] == "degraded"
+        assert health["database"]["failed_indexes"] == ["chapters.novel_chapter_number_unique"]
+    finally:
+        failed_indexes.clear()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_configuration():
+    await connect_to_mongo()
+    try:
+        await db_manager.get_db().command("ping")
+        stats = db_manager.pool_stats()
+        assert stats["connected"] is True
+        assert stats["max_pool_size"] == settings.MONGODB_MAX_POOL_SIZE
+        assert stats["total_checkouts"] > 0
+        # Los compresores sin paquete instalado se descartan
+        assert set(stats["compressors"]) <= {"zstd", "snappy", "zlib"}
+    finally:
+        await close_mongo_connection()
+
+    assert db_manager.pool_stats() == {"connected": False}
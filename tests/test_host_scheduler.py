@@ -0,0 +1,96 @@
+import asyncio
+import time
+import pytest
+from app.models.source import RateLimit
+from app.services.core.host_scheduler import HostScheduler, parse_retry_after
+
+URL = "https://novelbin.com/b/novela/capitulo-1"
+
+
+@pytest.mark.anyio
+async def test_requests_are_rate_limited_per_host():
+    """Test que verifica el token bucket y el límite de peticiones simultáneas por host."""
+    scheduler = HostScheduler(RateLimit(requests_per_second=20, burst=2, max_in_flight=2))
+    started = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request(url):
+        nonlocal in_flight, max_in_flight
+        async with scheduler.slot(url):
+            started.append(time.monotonic())
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    start = time.monotonic()
+    await asyncio.gather(*(request(URL) for _ in range(6)), request("https://pastebin.com/raw/abc"))
+
+    # 2 de ráfaga y luego una cada 50 ms: la sexta no empieza antes de 200 ms
+    assert max(started) - start >= 0.19
+    assert max_in_flight <= 3  # 2 de novelbin.com más la de pastebin.com
+    stats = scheduler.stats()
+    assert stats["novelbin.com"]["requests"] == 6
+    assert stats["novelbin.com"]["queue_depth"] == 0
+    assert stats["novelbin.com"]["wait_time_max_ms"] > 0
+    assert stats["pastebin.com"]["requests"] == 1
+
+
+@pytest.mark.anyio
+async def test_throttled_host_backs_off():
+    """Test que verifica que un 429 pausa el host durante su Retry-After."""
+    scheduler = HostScheduler(RateLimit(requests_per_second=100, burst=5, max_in_flight=2))
+
+    async with scheduler.slot(URL):
+        pass
+    # Retry-After solo admite segundos enteros: con "0.2" se usa el backoff exponencial
+    scheduler.record_status(URL, 429, "0.2")
+    scheduler.record_status(URL, 429, "1")
+    assert scheduler.stats()["novelbin.com"]["throttled"] == 2
+    assert 0.9 < scheduler.stats()["novelbin.com"]["backoff_seconds"] <= 1
+
+    # Otro host no se ve afectado
+    start = time.monotonic()
+    async with scheduler.slot("https://pastebin.com/raw/abc"):
+        pass
+    assert time.monotonic() - start < 0.1
+
+    start = time.monotonic()
+    async with scheduler.slot(URL):
+        pass
+    assert time.monotonic() - start >= 0.9
+
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.anyio
+async def test_host_rate_limit_follows_configuration():
+    """Test que verifica que el límite de un host cambia solo cuando cambia su configuración."""
+    scraperapi_limit = RateLimit(requests_per_second=5, burst=5, max_in_flight=5)
+    scheduler = HostScheduler(RateLimit(), host_rate_limits={"api.scraperapi.com": scraperapi_limit})
+    novelbin_limit = RateLimit(requests_per_second=0.5, burst=2, max_in_flight=2)
+
+    # El host ya se usó con el límite por defecto antes de configurarlo
+    async with scheduler.slot(URL):
+        pass
+    scheduler.set_rate_limit("https://novelbin.com", novelbin_limit)
+    state = scheduler._hosts["novelbin.com"]
+    assert state.rate_limit == novelbin_limit
+
+    # Volver a aplicar el mismo límite no toca el estado; uno editado se aplica en el momento
+    semaphore = state.semaphore
+    scheduler.set_rate_limit("https://novelbin.com", novelbin_limit)
+    assert state.semaphore is semaphore
+    edited_limit = RateLimit(requests_per_second=2, burst=2, max_in_flight=4)
+    scheduler.set_rate_limit("https://novelbin.com", edited_limit)
+    assert state.rate_limit == edited_limit
+    assert state.semaphore is not semaphore
+
+    # El fallback a ScraperAPI pasa por su propio host, con su propio límite
+    async with scheduler.slot("https://api.scraperapi.com/?url=" + URL):
+        pass
+    assert scheduler._hosts["api.scraperapi.com"].rate_limit == scraperapi_limit
+    assert state.rate_limit == edited_limit
@@ -0,0 +1,90 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpcore
+import httpx
+import pytest
+from app.services.core.http_clients import CachingDNSBackend, HttpClientRegistry
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    """Backend que registra las direcciones a las que se conecta y rechaza las de refused."""
+
+    def __init__(self, refused=()):
+        self.connected = []
+        self.refused = set(refused)
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.connected.append(host)
+        if host in self.refused:
+            raise httpcore.ConnectError(f"Connection refused: {host}")
+        return object()
+
+
+@pytest.mark.anyio
+async def test_dns_lookups_are_cached(monkeypatch):
+    """Test que verifica que las conexiones a un host reutilizan su resolución DNS."""
+    lookups = []
+
+    async def getaddrinfo(host, port, type=0):
+        lookups.append(host)
+        return [(None, None, None, "", ("10.0.0.1", port)), (None, None, None, "", ("10.0.0.2", port))]
+
+    backend = FakeBackend()
+    dns = CachingDNSBackend(ttl_seconds=60, backend=backend)
+    monkeypatch.setattr(dns, "_getaddrinfo", getaddrinfo)
+
+    for _ in range(3):
+        await dns.connect_tcp("novels.example", 443)
+    await dns.connect_tcp("127.0.0.1", 80)
+
+    assert lookups == ["novels.example"]
+    assert backend.connected == ["10.0.0.1", "10.0.0.1", "10.0.0.1", "127.0.0.1"]
+    assert dns.stats() == {"entries": 1, "hits": 2, "misses": 1}
+
+    # Si todas las direcciones fallan, la entrada se descarta y se vuelve a resolver
+    backend.refused = {"10.0.0.1", "10.0.0.2"}
+    with pytest.raises(httpcore.ConnectError):
+        await dns.connect_tcp("novels.example", 443)
+    backend.refused = {"10.0.0.1"}
+    await dns.connect_tcp("novels.example", 443)
+    assert lookups == ["novels.example", "novels.example"]
+    assert backend.connected[-1] == "10.0.0.2"
+
+
+@pytest.mark.anyio
+async def test_shared_client_uses_cached_dns():
+    """Test que verifica que el cliente httpx compartido conecta a través de la caché DNS."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b"capitulo"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    clients = HttpClientRegistry(http2=False)
+    port = server.server_address[1]
+
+    try:
+        response = await clients.http.get(f"http://localhost:{port}/capitulo-1")
+        assert response.status_code == 200
+        assert response.text == "capitulo"
+        assert clients.dns.stats()["misses"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        await clients.close()
+
+    # Los errores de conexión llegan como excepciones de httpx
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await clients.http.get(f"http://127.0.0.1:{port}/capitulo-1")
+    finally:
+        await clients.close()
@@ -1,4 +1,12 @@
+import asyncio
 import pytest
+from datetime import datetime
+from bson import ObjectId
+from app.repositories.novel_repository import NovelRepository
+from app.repositories.cache import TTLCache
+from app.repositories import novel_search
+from app.models.chapter import ChapterCreate
+from app.models.novel import NovelInDB, NovelSummary
 
 
 @pytest.mark.anyio
@@ -54,6 +62,28 @@ async def test_filter_novels_by_type(client, created_novels):
     assert len(novels) == 1  # Eleceed
 
 
+@pytest.mark.anyio
+async def test_search_novels(client, created_novels):
+    """Test que verifica la búsqueda de novelas sin acentos, por prefijo y combinada con filtros."""
+    response = await client.get("api/v1/novels/?search=electrica")
+    assert response.status_code == 200
+    assert [novel["_id"] for novel in response.json()] == [created_novels[2]["_id"]]
+
+    # Prefijos de varias palabras, en cualquier campo
+    response = await client.get("api/v1/novels/?search=begin turtle")
+    assert [novel["_id"] for novel in response.json()] == [created_novels[0]["_id"]]
+
+    response = await client.get("api/v1/novels/?search=shadow&type=manhwa")
+    assert response.json() == []
+
+    # Una novela actualizada se encuentra por su nuevo título
+    novel_id = created_novels[1]["_id"]
+    response = await client.patch(f"api/v1/novels/{novel_id}", json={"title": "Señor de las Sombras"})
+    assert response.status_code == 200
+    response = await client.get("api/v1/novels/?search=senor")
+    assert [novel["_id"] for novel in response.json()] == [novel_id]
+
+
 @pytest.mark.anyio
 async def test_get_novel_by_id(client, created_novels):
     """Test que verifica la obtención de una novela por ID."""
@@ -89,3 +119,161 @@ async def test_update_novel(client, created_novels):
     # Verificar que otros campos no cambiaron
     assert updated_novel["author"] == created_novels[0]["author"]
     assert updated_novel["description"] == created_novels[0]["description"]
+
+
+@pytest.mark.anyio
+async def test_reconcile_novel_counters(client, test_db, created_novels):
+    """Test que verifica que los contadores de la novela se reconstruyen a partir de sus capítulos."""
+    novel_id = created_novels[1]["_id"]
+    await test_db.chapters.insert_many(
+        [
+            {
+                "novel_id": novel_id,
+                "title": f"Chapter {number}",
+                "chapter_number": number,
+                "url": f"https://novelbin.com/b/shadow-slave/chapter-{number}",
+                "read": number <= 2,
+                "downloaded": number == 1,
+                "content_type": "novel",
+            }
+            for number in range(1, 6)
+        ]
+    )
+    await NovelRepository(test_db).reconcile_counters([ObjectId(novel_id)])
+
+    response = await client.get(f"api/v1/novels/{novel_id}")
+    assert response.status_code == 200
+    novel = response.json()
+
+    assert novel["total_chapters"] == 5
+    assert novel["last_chapter_number"] == 5
+    assert novel["read_chapters"] == 2
+    assert novel["downloaded_chapters"] == 1
+    assert novel["reading_progress"] == 40.0
+
+
+@pytest.mark.anyio
+async def test_novel_counters_follow_chapter_changes(client, test_db, created_novels, make_chapter):
+    """Test que verifica que los contadores de la novela se actualizan al modificar capítulos."""
+    novel_id = created_novels[1]["_id"]
+    chapter_repository = NovelRepository(test_db).chapter_repository
+
+    chapters = [await chapter_repository.create(make_chapter(novel_id, number)) for number in range(1, 4)]
+    await chapter_repository.mark_as_read(chapters[0].id)
+    await chapter_repository.mark_as_read(chapters[0].id)
+    await chapter_repository.mark_as_downloaded(chapters[2].id, str(chapters[2].url))
+    await chapter_repository.delete(chapters[2].id)
+
+    response = await client.get(f"api/v1/novels/{novel_id}")
+    assert response.status_code == 200
+    novel = response.json()
+
+    assert novel["total_chapters"] == 2
+    assert novel["last_chapter_number"] == 2
+    assert novel["read_chapters"] == 1
+    assert novel["downloaded_chapters"] == 0
+
+
+@pytest.mark.anyio
+async def test_clean_duplicate_chapters_job(client, test_db, created_novels):
+    """Test que verifica que la limpieza de capítulos duplicados se ejecuta como tarea en segundo plano."""
+    novel_id = created_novels[0]["_id"]
+    # Los duplicados solo pueden existir sin el índice único
+    await test_db.chapters.drop()
+    await test_db.chapters.insert_many(
+        [
+            {
+                "novel_id": novel_id,
+                "title": f"Chapter 1 v{version}",
+                "chapter_number": 1,
+                "url": "https://novelbin.com/b/shadow-slave/chapter-1",
+                "read": version == 0,
+                "downloaded": False,
+                "content_type": "novel",
+                "added_at": datetime(2024, 1, 1 + version),
+            }
+            for version in range(3)
+        ]
+    )
+
+    response = await client.post("api/v1/novels/clean-duplicates")
+    assert response.status_code == 202
+    job = response.json()
+
+    for _ in range(100):
+        response = await client.get(f"api/v1/novels/clean-duplicates/{job['id']}")
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] not in ("pending", "running"):
+            break
+        await asyncio.sleep(0.05)
+
+    assert job["status"] == "completed"
+    assert job["result"]["total_deleted"] == 2
+
+    chapters = await test_db.chapters.find({"novel_id": novel_id}).to_list(length=None)
+    assert len(chapters) == 1
+    assert chapters[0]["title"] == "Chapter 1 v2"
+    assert chapters[0]["read"] is True
+
+
+@pytest.mark.anyio
+async def test_novel_cache_is_invalidated_on_writes(test_db, created_novels):
+    """Test que verifica que la caché de novelas sirve lecturas repetidas y se invalida al escribir."""
+    cache = TTLCache("novels", max_entries=10, ttl_seconds=60)
+    novel_repository = NovelRepository(test_db, cache=cache)
+    novel_id = ObjectId(created_novels[0]["_id"])
+
+    await novel_repository.get_by_id(novel_id, include_chapters=False)
+    novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
+    assert novel.total_chapters == 0
+    assert cache.stats()["hits"] == 1
+
+    # Crear un capítulo cambia los contadores de la novela
+    await novel_repository.chapter_repository.create(
+        ChapterCreate(
+            novel_id=novel_id, title="Capítulo 1", chapter_number=1, url="https://example.com/1", content_type="novel"
+        )
+    )
+    novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
+    assert novel.total_chapters == 1
+
+    # Una caché desactivada siempre lee de la base de datos
+    cache.enabled = False
+    await test_db.novels.update_one({"_id": novel_id}, {"$set": {"title": "Cambiado fuera del repositorio"}})
+    novel = await novel_repository.get_by_id(novel_id, include_chapters=False)
+    assert novel.title == "Cambiado fuera del repositorio"
+
+
+@pytest.mark.anyio
+async def test_search_index_tracks_writes_while_tokenizing(test_db, created_novels, monkeypatch):
+    """Test que verifica que un borrado mientras se tokeniza el índice no deja la novela en las búsquedas."""
+    monkeypatch.setattr(novel_search, "BUILD_CHUNK_SIZE", 1)
+    index = novel_search.NovelSearchIndex(refresh_seconds=60)
+    deleted_id = created_novels[2]["_id"]
+
+    async def delete_during_build():
+        # Esperar a que la construcción ya haya leído las novelas y esté tokenizando
+        while not index._numbers:
+            await asyncio.sleep(0)
+        await test_db.novels.delete_one({"_id": ObjectId(deleted_id)})
+        index.remove(deleted_id)
+
+    await asyncio.gather(index.ensure_built(test_db.novels), delete_during_build())
+
+    # La escritura se detecta y la siguiente búsqueda reconstruye el índice
+    await index.ensure_built(test_db.novels)
+    assert index.search("electrica") == []
+
+
+@pytest.mark.anyio
+async def test_filter_novels_as_other_model(test_db, created_novels):
+    """Test que verifica que el filtro de novelas admite el model_class del repositorio base."""
+    novel_repository = NovelRepository(test_db)
+
+    summaries = await novel_repository.filter({})
+    assert all(isinstance(novel, NovelSummary) for novel in summaries)
+
+    novels = await novel_repository.filter({"type": "manhwa"}, model_class=NovelInDB)
+    assert [str(novel.id) for novel in novels] == [created_novels[2]["_id"]]
+    assert isinstance(novels[0], NovelInDB)
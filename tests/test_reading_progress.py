@@ -0,0 +1,101 @@
+import pytest
+from bson import ObjectId
+from app.db.migrations import backfill_reading_progress_chapters
+from app.models.chapter import ReadingProgressCreate
+from app.repositories.progress_buffer import ReadingProgressBuffer
+from app.repositories.reading_progress_repository import ReadingProgressRepository
+
+
+@pytest.mark.anyio
+async def test_progress_buffer_coalesces_writes(test_db):
+    """Test que verifica que el buffer guarda solo el último progreso y lo escribe al hacer flush."""
+    buffer = ReadingProgressBuffer(flush_interval=60)
+    buffer.start(test_db)
+    repository = ReadingProgressRepository(test_db, buffer=buffer)
+    user_id, chapter_id = ObjectId(), ObjectId()
+
+    try:
+        for progress in (0.1, 0.5, 0.8):
+            await repository.create_or_update(
+                ReadingProgressCreate(user_id=user_id, chapter_id=chapter_id, progress=progress)
+            )
+
+        # El usuario ve su propia escritura aunque aún no esté en la base de datos
+        assert (await repository.get_progress(user_id, chapter_id)).progress == 0.8
+        assert await test_db.reading_progress.count_documents({}) == 0
+
+        assert await buffer.flush() == 1
+    finally:
+        await buffer.stop()
+
+    stored = await test_db.reading_progress.find().to_list(length=None)
+    assert len(stored) == 1
+    assert stored[0]["progress"] == 0.8
+
+
+@pytest.mark.anyio
+async def test_buffered_progress_returns_stored_id(test_db):
+    """Test que verifica que una escritura en el buffer devuelve el id con el que queda guardado el progreso."""
+    buffer = ReadingProgressBuffer(flush_interval=60)
+    buffer.start(test_db)
+    repository = ReadingProgressRepository(test_db, buffer=buffer)
+    user_id, chapter_id, new_chapter_id = ObjectId(), ObjectId(), ObjectId()
+    stored_id = ObjectId()
+    await test_db.reading_progress.insert_one(
+        {"_id": stored_id, "user_id": str(user_id), "chapter_id": str(chapter_id), "progress": 0.1}
+    )
+
+    try:
+        existing = await repository.create_or_update(
+            ReadingProgressCreate(user_id=user_id, chapter_id=chapter_id, progress=0.5)
+        )
+        created = await repository.create_or_update(
+            ReadingProgressCreate(user_id=user_id, chapter_id=new_chapter_id, progress=0.5)
+        )
+        await buffer.flush()
+    finally:
+        await buffer.stop()
+
+    assert str(existing.id) == str(stored_id)
+    stored = await test_db.reading_progress.find_one({"chapter_id": str(new_chapter_id)})
+    assert str(created.id) == str(stored["_id"])
+
+
+@pytest.mark.anyio
+async def test_backfilled_progress_is_returned_per_novel(test_db):
+    """Test que verifica que el progreso existente recibe novel_id y se devuelve ordenado por capítulo."""
+    novel_id, user_id = ObjectId(), ObjectId()
+    chapters = [{"_id": ObjectId(), "novel_id": str(novel_id), "chapter_number": number} for number in (3, 1, 2)]
+    await test_db.chapters.insert_many(chapters)
+    # Documentos guardados antes de desnormalizar novel_id
+    await test_db.reading_progress.insert_many(
+        [{"user_id": str(user_id), "chapter_id": str(chapter["_id"]), "progress": 0.5} for chapter in chapters]
+    )
+
+    await backfill_reading_progress_chapters(test_db, batch_size=2)
+
+    progress = await ReadingProgressRepository(test_db).get_user_progress(user_id, novel_id)
+    assert [entry.chapter_number for entry in progress] == [1, 2, 3]
+    assert all(entry.novel_id == novel_id for entry in progress)
+
+
+@pytest.mark.anyio
+async def test_buffered_progress_without_chapter_number_is_listed(test_db):
+    """Test que verifica que el progreso sin chapter_number no rompe el listado por novela."""
+    buffer = ReadingProgressBuffer(flush_interval=60)
+    buffer.start(test_db)
+    repository = ReadingProgressRepository(test_db, buffer=buffer)
+    novel_id, user_id = ObjectId(), ObjectId()
+    await test_db.reading_progress.insert_one(
+        {"user_id": str(user_id), "chapter_id": str(ObjectId()), "novel_id": str(novel_id), "chapter_number": 2}
+    )
+
+    try:
+        await repository.create_or_update(
+            ReadingProgressCreate(user_id=user_id, chapter_id=ObjectId(), novel_id=novel_id, progress=0.5)
+        )
+        progress = await repository.get_user_progress(user_id, novel_id)
+    finally:
+        await buffer.stop()
+
+    assert [entry.chapter_number for entry in progress] == [None, 2]
@@ -0,0 +1,74 @@
+import pytest
+from types import SimpleNamespace
+from app.models.source import ResourcePolicy
+from app.services.core.base_scraper import BaseScraper, ScraperConfig
+
+
+class RoutingPage:
+    def __init__(self):
+        self.url = None
+        self.routes = {}
+
+    async def goto(self, url):
+        self.url = url
+
+    async def route(self, pattern, handler):
+        self.routes[pattern] = handler
+
+    async def unroute(self, pattern, handler):
+        assert self.routes.pop(pattern) == handler
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+def test_policy_blocks_resource_types_and_ad_domains():
+    """Test que verifica qué peticiones bloquea la política por defecto."""
+    policy = ResourcePolicy()
+
+    assert policy.blocks("image", "https://novelbin.com/cover.jpg")
+    assert policy.blocks("font", "https://fonts.gstatic.com/roboto.woff2")
+    assert policy.blocks("script", "https://pagead2.googlesyndication.com/pagead/show_ads.js")
+    assert policy.blocks("sub_frame", "https://cdn.pubadx.one/frame.html")
+    assert not policy.blocks("document", "https://novelbin.com/b/shadow-slave")
+    assert not policy.blocks("script", "https://novelbin.com/js/app.js")
+    assert not policy.blocks("stylesheet", "https://novelbin.com/css/site.css")
+    # Solo dominios completos: un host que contiene "criteo.com" no es criteo.com
+    assert not policy.blocks("script", "https://notcriteo.com/app.js")
+
+
+@pytest.mark.anyio
+async def test_scraper_routes_pooled_page_only_while_leased(fake_pool):
+    """Test que verifica que la política se instala al prestar la página y se retira al devolverla."""
+    pool, _ = fake_pool(RoutingPage, max_pages=1)
+    config = ScraperConfig(
+        name="texto",
+        base_url="https://novelbin.com",
+        content_type="novel",
+        selectors={},
+        patterns={},
+        use_playwright=True,
+        resource_policy=ResourcePolicy(),
+    )
+    scraper = BaseScraper(config, pool=pool)
+
+    async with scraper:
+        page = scraper._page
+        handler = page.routes["**/*"]
+        image, chapter = FakeRoute("image", "https://novelbin.com/cover.jpg"), FakeRoute("document", config.base_url)
+        await handler(image)
+        await handler(chapter)
+
+    assert (image.outcome, chapter.outcome) == ("abort", "continue")
+    assert scraper.blocked_requests == 1
+    assert page.routes == {}
+    await pool.close()
@@ -0,0 +1,32 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.services.utils import translation_service as translation_module
+
+
+class FakeGoogleTranslator:
+    """Imita deep_translator: guarda el texto en el estado de la instancia antes de "enviar" la petición."""
+
+    def __init__(self, source, target):
+        self._url_params = {}
+
+    def translate(self, text):
+        self._url_params["q"] = text
+        time.sleep(0.05)
+        return f"traducido: {self._url_params['q']}"
+
+
+@pytest.mark.anyio
+async def test_concurrent_translations_keep_their_own_text(monkeypatch):
+    """Test que verifica que dos capítulos traducidos a la vez reciben cada uno su propio texto."""
+    monkeypatch.setattr(settings, "IS_DEBUG", True)
+    monkeypatch.setattr(translation_module, "GoogleTranslator", FakeGoogleTranslator)
+    service = translation_module.TranslationService()
+
+    first, second = await asyncio.gather(
+        service.translate_text("<p>Capítulo 1</p>"), service.translate_text("<p>Capítulo 2</p>")
+    )
+
+    assert first == "traducido: <p>Capítulo 1</p>"
+    assert second == "traducido: <p>Capítulo 2</p>"